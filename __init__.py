@@ -11,8 +11,12 @@ bl_info = {
 import bpy
 import importlib
 
+from . import depsgraph_dispatcher
+from . import selection_tracker
 from . import boxdesign_tools
 from . import boxdesign_scale_to_volume
+from . import packing_utils
+from . import nesting_utils
 from . import boxdesign_lam_phang
 from . import boxdesign_bounding_box
 from . import boxdesign_calculateVolume
@@ -20,8 +24,15 @@ from . import th_tools
 from . import thdesign_circle_creator
 from . import shared_props
 from . import area_utils
+from . import volume_utils
+from . import separate_utils
+from . import loop_utils
+from . import svg_utils
+from . import curve_utils
 from . import thdesign_capsule_from_area
 from . import thdesign_capsule_from_diameter
+from . import grill_utils
+from . import thdesign_grill
 from . import modifier_tools
 from . import modifier_array_curve_mod
 from . import modifier_solidify
@@ -32,8 +43,12 @@ from . import settings
 from . import community
 
 # Reload modules for development
+importlib.reload(depsgraph_dispatcher)
+importlib.reload(selection_tracker)
 importlib.reload(boxdesign_tools)
 importlib.reload(boxdesign_scale_to_volume)
+importlib.reload(packing_utils)
+importlib.reload(nesting_utils)
 importlib.reload(boxdesign_lam_phang)
 importlib.reload(boxdesign_bounding_box)
 importlib.reload(boxdesign_calculateVolume)
@@ -41,8 +56,15 @@ importlib.reload(th_tools)
 importlib.reload(thdesign_circle_creator)
 importlib.reload(shared_props)
 importlib.reload(area_utils)
+importlib.reload(volume_utils)
+importlib.reload(separate_utils)
+importlib.reload(loop_utils)
+importlib.reload(svg_utils)
+importlib.reload(curve_utils)
 importlib.reload(thdesign_capsule_from_area)
 importlib.reload(thdesign_capsule_from_diameter)
+importlib.reload(grill_utils)
+importlib.reload(thdesign_grill)
 importlib.reload(modifier_tools)
 importlib.reload(modifier_array_curve_mod)
 importlib.reload(modifier_solidify)
@@ -53,8 +75,12 @@ importlib.reload(settings)
 importlib.reload(community)
 
 modules = (
+    depsgraph_dispatcher,
+    selection_tracker,
     boxdesign_tools,
     boxdesign_scale_to_volume,
+    packing_utils,
+    nesting_utils,
     boxdesign_lam_phang,
     boxdesign_bounding_box,
     boxdesign_calculateVolume,
@@ -62,8 +88,15 @@ modules = (
     thdesign_circle_creator,
     shared_props,
     area_utils,
+    volume_utils,
+    separate_utils,
+    loop_utils,
+    svg_utils,
+    curve_utils,
     thdesign_capsule_from_area,
     thdesign_capsule_from_diameter,
+    grill_utils,
+    thdesign_grill,
     modifier_tools,
     modifier_array_curve_mod,
     modifier_solidify,
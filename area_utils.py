@@ -1,29 +1,196 @@
 import bpy
 import math
+import time
+import numpy as np
+from bpy.app.handlers import persistent
 
-def calculate_area_of_selected_object():
-    obj = bpy.context.active_object
+from . import depsgraph_dispatcher
+
+# Cache diện tích: (con trỏ object, tên) -> (ma trận world, dấu vân tay hình học, diện tích)
+_area_cache = {}
+
+
+def mesh_local_coords(mesh):
+    # Buffer float32 khớp kiểu dữ liệu của Blender nên foreach_get chép thẳng bộ nhớ
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    return co.reshape(-1, 3).astype(np.float64)
+
+
+def set_mesh_local_coords(mesh, coords):
+    mesh.vertices.foreach_set("co", np.ascontiguousarray(coords, dtype=np.float32).ravel())
+    mesh.update()
+
+
+def mesh_world_coords(mesh, matrix_world):
+    # Toạ độ đỉnh world space (N, 3)
+    count = len(mesh.vertices)
+    coords = np.empty((count, 4), dtype=np.float64)
+    coords[:, :3] = mesh_local_coords(mesh)
+    coords[:, 3] = 1.0
+    return (coords @ np.array(matrix_world, dtype=np.float64).T)[:, :3]
+
+
+def mesh_triangle_indices(mesh):
+    mesh.calc_loop_triangles()
+    tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("vertices", tris)
+    return tris.reshape(-1, 3)
+
+
+def triangle_areas(coords, tris):
+    a = coords[tris[:, 0]]
+    b = coords[tris[:, 1]]
+    c = coords[tris[:, 2]]
+    return 0.5 * np.linalg.norm(np.cross(b - a, c - a), axis=1)
+
+
+def mesh_surface_area(mesh, matrix_world):
+    # Tổng diện tích bề mặt (world space)
+    tris = mesh_triangle_indices(mesh)
+    if not len(tris):
+        return 0.0
+    coords = mesh_world_coords(mesh, matrix_world)
+    return float(triangle_areas(coords, tris).sum())
+
+
+def _mesh_surface_area_loop(mesh, matrix_world):
+    # Cách tính cũ (vòng lặp Python), chỉ giữ lại để so sánh trong benchmark_area
+    mesh.calc_loop_triangles()
+    area = 0.0
+    for tri in mesh.loop_triangles:
+        verts = [matrix_world @ mesh.vertices[i].co for i in tri.vertices]
+        a, b, c = verts
+        area += ((b - a).cross(c - a)).length / 2.0
+    return area
+
+
+def _area_cache_key(obj):
+    return (obj.as_pointer(), obj.name)
+
+
+def _geometry_fingerprint(obj):
+    # Dấu vân tay rẻ tiền của hình học gốc, không cần evaluate depsgraph
+    data = obj.data
+    if obj.type == 'MESH':
+        counts = (len(data.vertices), len(data.edges), len(data.polygons))
+    else:
+        counts = (len(data.splines),)
+    modifiers = tuple((m.name, m.type, m.show_viewport) for m in obj.modifiers)
+    return (data.as_pointer(),) + counts + modifiers
+
+
+def _matrix_key(matrix_world):
+    return tuple(round(v, 6) for row in matrix_world for v in row)
+
+
+def invalidate_area_cache(obj=None):
+    if obj is None:
+        _area_cache.clear()
+    else:
+        _area_cache.pop(_area_cache_key(obj), None)
+
+
+def calculate_area_of_selected_object(use_cache=True, obj=None):
+    # Thanh trượt viên nang truyền object nguồn: sau lần đầu active object đã là viên nang
+    obj = obj or bpy.context.active_object
     if not obj or obj.type not in {'MESH', 'CURVE'}:
         return None
-    
+
+    key = _area_cache_key(obj)
+    matrix_key = _matrix_key(obj.matrix_world)
+    fingerprint = _geometry_fingerprint(obj)
+    if use_cache:
+        cached = _area_cache.get(key)
+        if cached and cached[0] == matrix_key and cached[1] == fingerprint:
+            return cached[2]
+
     # Lấy đối tượng
     depsgraph = bpy.context.evaluated_depsgraph_get()
     obj_eval = obj.evaluated_get(depsgraph)
-    
+
     # Chuyển đổi thành lưới (hoạt động cho cả đối tượng Lưới và Đường cong)
     mesh = obj_eval.to_mesh(preserve_all_data_layers=True, depsgraph=depsgraph)
     if not mesh:
         return None
-    
+
     # Tính diện tích bằng cách sử dụng tam giác
-    mesh.calc_loop_triangles()
-    area = 0.0
-    for tri in mesh.loop_triangles:
-        verts = [obj_eval.matrix_world @ mesh.vertices[i].co for i in tri.vertices]
-        a, b, c = verts
-        area += ((b - a).cross(c - a)).length / 2.0
-    
+    area = mesh_surface_area(mesh, obj_eval.matrix_world)
+
     # Dọn sạch lưới tạm thời
     obj_eval.to_mesh_clear()
-    
+
+    _area_cache[key] = (matrix_key, fingerprint, area)
     return area
+
+
+def invalidate_area_cache_from_events(scene, events):
+    if not _area_cache:
+        return
+    for id_data in events.geometry_ids + events.transform_ids:
+        if isinstance(id_data, bpy.types.Object):
+            invalidate_area_cache(id_data)
+        elif isinstance(id_data, (bpy.types.Mesh, bpy.types.Curve)):
+            # Dữ liệu dùng chung: xoá mọi object đang dùng datablock này
+            pointer = id_data.as_pointer()
+            for key, (_, fingerprint, _) in list(_area_cache.items()):
+                if fingerprint[0] == pointer:
+                    del _area_cache[key]
+
+
+@persistent
+def area_cache_load_handler(*args):
+    invalidate_area_cache()
+
+
+def benchmark_area(obj=None, repeat=3):
+    # Vòng lặp cũ so với kernel NumPy
+    obj = obj or bpy.context.active_object
+    if not obj or obj.type not in {'MESH', 'CURVE'}:
+        print("benchmark_area: cần chọn một đối tượng Mesh hoặc Curve")
+        return None
+
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    obj_eval = obj.evaluated_get(depsgraph)
+    mesh = obj_eval.to_mesh(preserve_all_data_layers=True, depsgraph=depsgraph)
+    matrix_world = obj_eval.matrix_world.copy()
+
+    def best_of(func):
+        best = math.inf
+        result = 0.0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func(mesh, matrix_world)
+            best = min(best, time.perf_counter() - start)
+        return best, result
+
+    loop_time, loop_area = best_of(_mesh_surface_area_loop)
+    numpy_time, numpy_area = best_of(mesh_surface_area)
+    triangles = len(mesh.loop_triangles)
+    obj_eval.to_mesh_clear()
+
+    speedup = loop_time / numpy_time if numpy_time > 0 else math.inf
+    print(f"[area] {obj.name}: {triangles} tam giác")
+    print(f"  loop : {loop_time * 1000:.2f} ms  (area={loop_area:.4f})")
+    print(f"  numpy: {numpy_time * 1000:.2f} ms  (area={numpy_area:.4f})")
+    print(f"  nhanh hơn {speedup:.1f}x")
+    return {
+        "triangles": triangles,
+        "loop_time": loop_time,
+        "numpy_time": numpy_time,
+        "speedup": speedup,
+        "area": numpy_area,
+    }
+
+
+def register():
+    depsgraph_dispatcher.subscribe("area_cache", invalidate_area_cache_from_events, {'GEOMETRY', 'TRANSFORM'}, priority=-10)
+    if area_cache_load_handler not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(area_cache_load_handler)
+
+
+def unregister():
+    depsgraph_dispatcher.unsubscribe("area_cache")
+    if area_cache_load_handler in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(area_cache_load_handler)
+    invalidate_area_cache()
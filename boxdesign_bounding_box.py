@@ -4,57 +4,176 @@ bl_info = {
     "version": (1, 3),
     "blender": (4, 3, 0),
     "location": "View3D > Sidebar > Box Design",
-    "description": "Create axis-aligned bounding boxes from selected objects",
+    "description": "Create axis-aligned or minimum-volume oriented bounding boxes from selected objects",
     "category": "Add Mesh",
 }
 
 import bpy
+import time
+import numpy as np
 from bpy.types import Operator, Panel, Object
-from mathutils import Vector, Euler
+from bpy.app.handlers import persistent
+from mathutils import Matrix, Vector
 from typing import Tuple, List
 
-# ---------- UTILITY FUNCTIONS ----------
-
-def set_object_origin_location(origin_location: Vector) -> None:
-    old_cursor_location = bpy.context.scene.cursor.location.copy()
-    bpy.context.scene.cursor.location = origin_location
-    bpy.ops.object.origin_set(type="ORIGIN_CURSOR")
-    bpy.context.scene.cursor.location = old_cursor_location
+from . import depsgraph_dispatcher
+from .area_utils import mesh_world_coords, set_mesh_local_coords
 
-def set_bounding_box_origin_to_corner(bounding_box: Object) -> None:
-    new_origin = bounding_box.matrix_world @ bounding_box.data.vertices[0].co
-    set_object_origin_location(new_origin)
-
-def get_selected_objects_vertices(selected_objects: List[Object], active_object: Object = None, is_align_active_object: bool = False) -> List[Vector]:
-    vertices = []
-    for obj in selected_objects:
-        vertices.extend([obj.matrix_world @ v.co for v in obj.data.vertices])
-    if is_align_active_object and active_object:
-        inv = active_object.matrix_world.inverted()
-        vertices = [inv @ v for v in vertices]
-    return vertices
+# ---------- UTILITY FUNCTIONS ----------
 
-def get_bounding_box_range(vertices: List[Vector]) -> Tuple[tuple]:
-    return tuple((min(c), max(c)) for c in zip(*[(v.x, v.y, v.z) for v in vertices]))
+# 6 mặt quad của hộp, pháp tuyến hướng ra ngoài (thứ tự đỉnh theo box_corners)
+BOX_FACES = (
+    (0, 3, 2, 1), (4, 5, 6, 7),
+    (0, 1, 5, 4), (1, 2, 6, 5),
+    (2, 3, 7, 6), (3, 0, 4, 7),
+)
 
-def get_bounding_box_dimensions(bbox_range: Tuple[tuple]) -> Vector:
-    return Vector(axis[1] - axis[0] for axis in bbox_range)
+def box_corners(size) -> np.ndarray:
+    half = np.asarray(size, dtype=np.float64) / 2.0
+    signs = np.array([
+        (-1, -1, -1), (1, -1, -1), (1, 1, -1), (-1, 1, -1),
+        (-1, -1, 1), (1, -1, 1), (1, 1, 1), (-1, 1, 1),
+    ], dtype=np.float64)
+    return signs * half
 
-def get_bounding_box_corner_location(bbox_range: Tuple[tuple], active_object: Object = None, is_align_active_object: bool = False) -> Vector:
-    corner = Vector(axis[0] for axis in bbox_range)
+def get_frame_matrix(active_object: Object = None, is_align_active_object: bool = False) -> Matrix:
+    # Hệ toạ độ world, hoặc vị trí + hướng xoay của active object (bỏ scale)
     if is_align_active_object and active_object:
-        return active_object.matrix_world @ corner
-    return corner
-
-def create_basic_bounding_box(corner: Vector, size: Vector, rotation: Euler) -> Object:
-    bpy.ops.mesh.primitive_cube_add()
-    box = bpy.context.active_object
-    set_bounding_box_origin_to_corner(box)
-    box.dimensions = size
-    box.location = corner
-    box.rotation_euler = rotation
+        loc, rot, _ = active_object.matrix_world.decompose()
+        return Matrix.Translation(loc) @ rot.to_matrix().to_4x4()
+    return Matrix.Identity(4)
+
+def get_selected_objects_coords(selected_objects: List[Object], frame: Matrix) -> np.ndarray:
+    inv = frame.inverted()
+    parts = [mesh_world_coords(obj.data, inv @ obj.matrix_world) for obj in selected_objects if len(obj.data.vertices)]
+    if not parts:
+        return np.empty((0, 3))
+    return np.concatenate(parts)
+
+def get_bounding_box_range(coords: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    return coords.min(axis=0), coords.max(axis=0)
+
+def write_box_vertices(mesh, size) -> None:
+    set_mesh_local_coords(mesh, box_corners(size))
+
+def build_box_object(name: str, frame: Matrix, bbox_min, bbox_max) -> Object:
+    # Hộp 8 đỉnh tạo thẳng từ mesh data, origin ở tâm
+    size = np.asarray(bbox_max) - np.asarray(bbox_min)
+    center = (np.asarray(bbox_min) + np.asarray(bbox_max)) / 2.0
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(box_corners(size).tolist(), [], BOX_FACES)
+    mesh.update()
+    box = bpy.data.objects.new(name, mesh)
+    box.matrix_world = frame @ Matrix.Translation(Vector(center))
     return box
 
+def _extreme_candidates(points: np.ndarray, bins: int) -> np.ndarray:
+    # Chỉ giữ điểm cực trị theo từng cột lưới; chỉ dùng để chọn hướng hộp
+    lo = points.min(axis=0)
+    span = points.max(axis=0) - lo
+    span[span <= 0] = 1.0
+    cells = np.minimum(((points - lo) / span * bins).astype(np.intp), bins - 1)
+    dims = points.shape[1]
+    keep = np.zeros(len(points), dtype=bool)
+    for axis in range(dims):
+        others = [k for k in range(dims) if k != axis]
+        column = np.zeros(len(points), dtype=np.intp)
+        for k in others:
+            column = column * bins + cells[:, k]
+        value = points[:, axis]
+        low = np.full(bins ** len(others), np.inf)
+        high = np.full(bins ** len(others), -np.inf)
+        np.minimum.at(low, column, value)
+        np.maximum.at(high, column, value)
+        keep |= (value == low[column]) | (value == high[column])
+    return points[keep]
+
+def convex_hull_2d(points: np.ndarray) -> np.ndarray:
+    # Monotone chain, ngược chiều kim đồng hồ
+    if len(points) > 4096:
+        points = _extreme_candidates(points, 1024)
+    points = np.unique(points, axis=0)
+    if len(points) < 3:
+        return points
+
+    def half(pts):
+        chain = []
+        for p in pts:
+            while len(chain) >= 2:
+                o, a = chain[-2], chain[-1]
+                if (a[0] - o[0]) * (p[1] - o[1]) - (a[1] - o[1]) * (p[0] - o[0]) > 0:
+                    break
+                chain.pop()
+            chain.append(p)
+        return chain
+
+    pts = points.tolist()
+    lower = half(pts)
+    upper = half(reversed(pts))
+    return np.array(lower[:-1] + upper[:-1])
+
+def _min_area_rectangle(hull: np.ndarray) -> Tuple[np.ndarray, float]:
+    # Rotating calipers trên mọi cạnh của bao lồi
+    edges = np.roll(hull, -1, axis=0) - hull
+    lengths = np.linalg.norm(edges, axis=1)
+    edges = edges[lengths > 1e-12] / lengths[lengths > 1e-12, None]
+    if not len(edges):
+        return np.eye(2), 0.0
+    best_area = np.inf
+    best_axes = np.eye(2)
+    chunk = max(1, 4_000_000 // max(len(hull), 1))
+    for start in range(0, len(edges), chunk):
+        u = edges[start:start + chunk]
+        v = np.stack((-u[:, 1], u[:, 0]), axis=1)
+        pu = hull @ u.T
+        pv = hull @ v.T
+        area = (pu.max(axis=0) - pu.min(axis=0)) * (pv.max(axis=0) - pv.min(axis=0))
+        i = int(np.argmin(area))
+        if area[i] < best_area:
+            best_area = float(area[i])
+            best_axes = np.stack((u[i], v[i]))
+    return best_axes, best_area
+
+def oriented_bounding_box(coords: np.ndarray, iterations: int = 4) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # PCA rồi tinh chỉnh bằng rotating calipers; trả về (axes, min, max)
+    centered = coords - coords.mean(axis=0)
+    if len(centered) > 20000:
+        centered = _extreme_candidates(centered, 64)
+    _, vectors = np.linalg.eigh(centered.T @ centered)
+    axes = vectors.T[::-1]
+
+    def volume_of(axes):
+        proj = centered @ axes.T
+        extent = proj.max(axis=0) - proj.min(axis=0)
+        # Chặn dưới để mesh phẳng (một chiều bằng 0) vẫn so sánh được theo diện tích
+        return float(np.prod(np.maximum(extent, 1e-9 * max(extent.max(), 1e-12))))
+
+    best_axes = axes
+    best_volume = volume_of(axes)
+    for _ in range(iterations):
+        improved = False
+        current = best_axes
+        for k in range(3):
+            up = current[k]
+            plane = np.delete(current, k, axis=0)
+            hull = convex_hull_2d(centered @ plane.T)
+            if len(hull) < 3:
+                continue
+            rect, _ = _min_area_rectangle(hull)
+            candidate = np.stack((rect[0] @ plane, rect[1] @ plane, up))
+            volume = volume_of(candidate)
+            if volume < best_volume * (1 - 1e-9):
+                best_volume = volume
+                best_axes = candidate
+                improved = True
+        if not improved:
+            break
+    if np.linalg.det(best_axes) < 0:
+        best_axes = best_axes.copy()
+        best_axes[2] = -best_axes[2]
+    proj = coords @ best_axes.T
+    return best_axes, proj.min(axis=0), proj.max(axis=0)
+
 def get_selected_and_active(is_separate: bool = False) -> Tuple[List[Object], Object]:
     selected = [o for o in bpy.context.selected_objects if o.type == "MESH"]
     active = bpy.context.active_object
@@ -62,37 +181,181 @@ def get_selected_and_active(is_separate: bool = False) -> Tuple[List[Object], Ob
         selected.remove(active)
     return selected, active
 
-def create_bounding_box(selected, active, align_to_active) -> Object:
-    # Apply scale cho các đối tượng được chọn
-    bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
-
-    # Tính toán bounding box
-    verts = get_selected_objects_vertices(selected, active, align_to_active)
-    bbox_range = get_bounding_box_range(verts)
-    corner = get_bounding_box_corner_location(bbox_range, active, align_to_active)
-    size = get_bounding_box_dimensions(bbox_range)
-    rotation = active.rotation_euler if align_to_active and active else Euler()
-
-    # Đặt tên cho bounding box
-    bbox_name = f"{active.name}_bounding" if active else "Bounding_Box"
+def update_box_in_place(bbox: Object, frame: Matrix, coords: np.ndarray) -> None:
+    # Giữ nguyên datablock, vật liệu và thiết lập của hình bao cũ
+    bbox_min, bbox_max = get_bounding_box_range(coords)
+    size = bbox_max - bbox_min
+    center = (bbox_min + bbox_max) / 2.0
+    mesh = bbox.data
+    if len(mesh.vertices) == 8:
+        write_box_vertices(mesh, size)
+    else:
+        mesh.clear_geometry()
+        mesh.from_pydata(box_corners(size).tolist(), [], BOX_FACES)
+        mesh.update()
+    bbox.matrix_world = frame @ Matrix.Translation(Vector(center))
+
+def replace_bounding_box(name: str, frame: Matrix, coords: np.ndarray, keep_existing: bool = False) -> Object:
+    old_bbox = bpy.data.objects.get(name)
+    if old_bbox and keep_existing and old_bbox.type == 'MESH':
+        update_box_in_place(old_bbox, frame, coords)
+        return old_bbox
 
     # Xoá bounding box cũ nếu đã tồn tại
-    old_bbox = bpy.data.objects.get(bbox_name)
     if old_bbox:
         bpy.data.objects.remove(old_bbox, do_unlink=True)
 
-    # Tạo bounding box mới
-    bbox = create_basic_bounding_box(corner, size, rotation)
-    bbox.name = bbox_name
-
-    # Đặt origin về tâm bounding box
-    bpy.ops.object.origin_set(type="ORIGIN_GEOMETRY", center="BOUNDS")
+    bbox_min, bbox_max = get_bounding_box_range(coords)
+    bbox = build_box_object(name, frame, bbox_min, bbox_max)
+    bpy.context.collection.objects.link(bbox)
 
     # Hiển thị dưới dạng wireframe
     bbox.display_type = 'WIRE'
-    
     return bbox
 
+# ---------- LIVE BOUNDING BOX ----------
+
+LIVE_SOURCES_PROP = "bbox_live_sources"
+LIVE_ACTIVE_PROP = "bbox_live_active"
+LIVE_MODE_PROP = "bbox_live_coordinate_system"
+# Khoảng thời gian tối thiểu giữa hai lần cập nhật hình bao live (giây)
+LIVE_UPDATE_INTERVAL = 0.1
+
+# Tên object nguồn -> tên các hình bao live phụ thuộc vào nó
+_live_index = {}
+_live_index_dirty = True
+
+def mark_live_bounding_box(bbox: Object, sources: List[Object], active: Object, coordinate_system: str) -> None:
+    global _live_index_dirty
+    # Không để hình bao tự theo dõi chính nó (tránh vòng cập nhật vô hạn)
+    bbox[LIVE_SOURCES_PROP] = [obj.name for obj in sources if obj != bbox]
+    bbox[LIVE_ACTIVE_PROP] = active.name if active else ""
+    bbox[LIVE_MODE_PROP] = coordinate_system
+    _live_index_dirty = True
+
+def _rebuild_live_index() -> None:
+    global _live_index_dirty
+    _live_index.clear()
+    for obj in bpy.data.objects:
+        sources = obj.get(LIVE_SOURCES_PROP)
+        if sources is None:
+            continue
+        for name in list(sources) + [obj.get(LIVE_ACTIVE_PROP, "")]:
+            if name:
+                _live_index.setdefault(name, set()).add(obj.name)
+    _live_index_dirty = False
+
+def refresh_live_bounding_box(bbox: Object) -> bool:
+    sources = [bpy.data.objects.get(name) for name in bbox.get(LIVE_SOURCES_PROP, ())]
+    sources = [obj for obj in sources if obj and obj.type == 'MESH']
+    if not sources:
+        return False
+    active = bpy.data.objects.get(bbox.get(LIVE_ACTIVE_PROP, ""))
+    frame, coords = get_box_frame_and_coords(sources, active, bbox.get(LIVE_MODE_PROP, "world"))
+    if not len(coords):
+        return False
+    update_box_in_place(bbox, frame, coords)
+    return True
+
+def update_live_boxes_from_events(scene, events) -> None:
+    global _live_index_dirty
+    if _live_index_dirty:
+        _rebuild_live_index()
+    if not _live_index:
+        return
+    changed = {id_data.name for id_data in events.geometry_ids + events.transform_ids
+               if isinstance(id_data, Object)}
+    box_names = set()
+    for name in changed:
+        box_names.update(_live_index.get(name, ()))
+    for name in box_names:
+        bbox = bpy.data.objects.get(name)
+        if bbox is None or LIVE_SOURCES_PROP not in bbox:
+            _live_index_dirty = True
+            continue
+        refresh_live_bounding_box(bbox)
+
+@persistent
+def live_bounding_box_load_handler(*args) -> None:
+    global _live_index_dirty
+    _live_index_dirty = True
+
+def select_only(objects: List[Object]) -> None:
+    for obj in bpy.context.selected_objects:
+        obj.select_set(False)
+    for obj in objects:
+        obj.select_set(True)
+    if objects:
+        bpy.context.view_layer.objects.active = objects[-1]
+
+def get_box_frame_and_coords(objects: List[Object], active: Object, coordinate_system: str) -> Tuple[Matrix, np.ndarray]:
+    if coordinate_system == "oriented":
+        coords = get_selected_objects_coords(objects, Matrix.Identity(4))
+        if not len(coords):
+            return Matrix.Identity(4), coords
+        axes, _, _ = oriented_bounding_box(coords)
+        frame = Matrix(axes.T.tolist()).to_4x4()
+        return frame, coords @ axes.T
+    frame = get_frame_matrix(active, coordinate_system == "active_object")
+    return frame, get_selected_objects_coords(objects, frame)
+
+def create_bounding_box(selected, active, coordinate_system, live: bool = False) -> Object:
+    # Tính toán bounding box từ toạ độ lấy hàng loạt, không dùng operator hay 3D cursor
+    frame, coords = get_box_frame_and_coords(selected, active, coordinate_system)
+    if not len(coords):
+        return None
+
+    # Đặt tên cho bounding box
+    bbox_name = f"{active.name}_bounding" if active else "Bounding_Box"
+    bbox = replace_bounding_box(bbox_name, frame, coords, keep_existing=live)
+    if live:
+        mark_live_bounding_box(bbox, selected, active, coordinate_system)
+    select_only([bbox])
+    return bbox
+
+def create_bounding_boxes_per_object(selected, coordinate_system, live: bool = False) -> List[Object]:
+    # Chế độ batch: mỗi object một hình bao
+    boxes = []
+    for obj in selected:
+        frame, coords = get_box_frame_and_coords([obj], obj, coordinate_system)
+        if not len(coords):
+            continue
+        bbox = replace_bounding_box(f"{obj.name}_bounding", frame, coords, keep_existing=live)
+        if live:
+            mark_live_bounding_box(bbox, [obj], obj, coordinate_system)
+        boxes.append(bbox)
+    select_only(boxes)
+    return boxes
+
+def benchmark_bounding_box(objects: List[Object] = None, repeat: int = 3) -> dict:
+    # Hộp theo trục world so với hộp có hướng
+    objects = objects or [o for o in bpy.context.selected_objects if o.type == "MESH"]
+    if not objects:
+        print("benchmark_bounding_box: cần chọn ít nhất một mesh")
+        return None
+
+    def best_of(coordinate_system):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            _, coords = get_box_frame_and_coords(objects, None, coordinate_system)
+            bbox_min, bbox_max = get_bounding_box_range(coords)
+            best = min(best, time.perf_counter() - start)
+        return best, float(np.prod(bbox_max - bbox_min)), len(coords)
+
+    aabb_time, aabb_volume, count = best_of("world")
+    obb_time, obb_volume, _ = best_of("oriented")
+    print(f"[bounding box] {len(objects)} object, {count} đỉnh")
+    print(f"  world   : {aabb_time * 1000:.1f} ms, thể tích {aabb_volume:.2f}")
+    print(f"  oriented: {obb_time * 1000:.1f} ms, thể tích {obb_volume:.2f}")
+    return {
+        "vertices": count,
+        "aabb_time": aabb_time,
+        "aabb_volume": aabb_volume,
+        "obb_time": obb_time,
+        "obb_volume": obb_volume,
+    }
+
 # ---------- OPERATOR ----------
 
 class MESH_OT_bounding_box(Operator):
@@ -105,6 +368,7 @@ class MESH_OT_bounding_box(Operator):
         items=[
             ("active_object", "Active Object", "Use active object's coordinate system"),
             ("world", "World", "Use world coordinate system"),
+            ("oriented", "Minimum Volume", "Fit the tightest oriented box (PCA + rotating calipers)"),
         ],
         name="Coordinate System",
         default="active_object",
@@ -116,6 +380,18 @@ class MESH_OT_bounding_box(Operator):
         description="Exclude active object from bounding box calculation",
     )
 
+    is_batch: bpy.props.BoolProperty(
+        name="One Box per Object",
+        default=False,
+        description="Create a separate bounding box for each selected object (aligned to its own axes when using Active Object)",
+    )
+
+    is_live: bpy.props.BoolProperty(
+        name="Live Update",
+        default=False,
+        description="Keep the bounding box and update it in place when the source objects change",
+    )
+
     is_wireframe: bpy.props.BoolProperty(
         name="Display as Wireframe",
         default=False,
@@ -140,12 +416,20 @@ class MESH_OT_bounding_box(Operator):
             self.report({'WARNING'}, "Need at least one selected object and an active object")
             return {'CANCELLED'}
 
-        align = self.coordinate_system == "active_object"
-        bbox = create_bounding_box(selected, active, align)
+        if self.is_batch:
+            boxes = create_bounding_boxes_per_object(selected, self.coordinate_system, self.is_live)
+        else:
+            bbox = create_bounding_box(selected, active, self.coordinate_system, self.is_live)
+            boxes = [bbox] if bbox else []
 
-        if self.is_wireframe:
-            bbox.display_type = 'WIRE'
-        bbox.hide_render = not self.is_render
+        if not boxes:
+            self.report({'WARNING'}, "Selected objects have no vertices")
+            return {'CANCELLED'}
+
+        for bbox in boxes:
+            if self.is_wireframe:
+                bbox.display_type = 'WIRE'
+            bbox.hide_render = not self.is_render
 
         return {'FINISHED'}
 
@@ -174,8 +458,17 @@ bl_classes = (
 def register():
     for cls in bl_classes:
         bpy.utils.register_class(cls)
+    depsgraph_dispatcher.subscribe(
+        "live_bounding_boxes", update_live_boxes_from_events,
+        {'GEOMETRY', 'TRANSFORM'}, debounce=LIVE_UPDATE_INTERVAL,
+    )
+    if live_bounding_box_load_handler not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(live_bounding_box_load_handler)
 
 def unregister():
+    depsgraph_dispatcher.unsubscribe("live_bounding_boxes")
+    if live_bounding_box_load_handler in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(live_bounding_box_load_handler)
     for cls in reversed(bl_classes):
         bpy.utils.unregister_class(cls)
 
@@ -1,32 +1,18 @@
 import bpy
-import bmesh
 from bpy.props import FloatProperty
 
+from .volume_utils import evaluated_volume, analyse_watertight, draw_watertight_report
+
 
 def compute_volume(obj, depsgraph):
     if obj.type != 'MESH':
         return 0.0
 
-    eval_obj = obj.evaluated_get(depsgraph)
-    mesh = eval_obj.to_mesh()
-
-    if not mesh:
-        return 0.0
-
-    bm = bmesh.new()
-    bm.from_mesh(mesh)
-
     try:
-        volume_local = bm.calc_volume(signed=False)
+        volume_world = evaluated_volume(obj, depsgraph)
     except Exception as e:
         print("Lỗi khi tính thể tích:", e)
-        volume_local = 0.0
-
-    bm.free()
-    eval_obj.to_mesh_clear()
-
-    scale = obj.matrix_world.to_scale()
-    volume_world = volume_local * scale.x * scale.y * scale.z
+        volume_world = 0.0
 
     # Đơn vị chiều dài đang là mm, nên thể tích tính ra là mm³
     # 1 lít = 1,000,000 mm³ → nhân 1e-6 để ra lít
@@ -74,6 +60,7 @@ class OBJECT_PT_VolumePanel(bpy.types.Panel):
 
         layout.operator("object.calculate_volume_liters")
         layout.label(text=f"Thể tích: {obj.volume_liters:.6f} L")
+        draw_watertight_report(layout, analyse_watertight(obj.data))
 
 
 def register():
@@ -8,94 +8,153 @@ import bpy
 import math
 import numpy as np
 from mathutils import Vector, Matrix
+from bpy.app.handlers import persistent
+
+from .area_utils import mesh_local_coords, set_mesh_local_coords
+from .packing_utils import pack_rectangles
+from .nesting_utils import nest_polygons, polygon_area, make_executor, PARALLEL_MIN_PARTS
+from .boxdesign_bounding_box import convex_hull_2d
+from .loop_utils import chain_loops
+
+# Kết quả lần xếp tấm gần nhất để panel hiển thị: (tỷ lệ sử dụng từng tấm, số chi tiết quá khổ)
+_last_pack_report = ([], 0)
+
+# Cache kết quả làm phẳng: (con trỏ object, tên) -> (dấu vân tay mesh, ma trận đã ghi, dữ liệu footprint)
+_flatten_cache = {}
 
 # --- PCA ALIGNMENT ---
-def align_object_points_to_xy(obj):
-    verts = [obj.matrix_world @ v.co for v in obj.data.vertices]
-    coords = np.array([[v.x, v.y, v.z] for v in verts])
+def flatten_object(obj):
+    # Chưa ghi transform vào object; trả về ma trận world cuối cùng và footprint 2D
+    mesh = obj.data
+    local = mesh_local_coords(mesh)
+    matrix = obj.matrix_world.copy()
+    if not len(local):
+        loc = matrix.translation
+        return {'obj': obj, 'matrix': matrix, 'width': 0.0, 'height': 0.0, 'min_x': loc.x, 'min_y': loc.y,
+                'points': np.zeros((0, 2))}
 
-    centroid = np.mean(coords, axis=0)
-    centered = coords - centroid
+    # Origin về tâm bounds (thay cho origin_set ORIGIN_GEOMETRY/BOUNDS)
+    center = (local.min(axis=0) + local.max(axis=0)) / 2.0
+    if mesh.users == 1 and np.abs(center).max() > 1e-6:
+        set_mesh_local_coords(mesh, local - center)
+        matrix = matrix @ Matrix.Translation(Vector(center))
 
-    _, _, vh = np.linalg.svd(centered, full_matrices=False)
-    normal = vh[2]
+    mat = np.array(obj.matrix_world, dtype=np.float64)
+    world = local @ mat[:3, :3].T + mat[:3, 3]
 
-    if normal[2] < 0:
-        normal = -normal
+    # Mesh đã nằm phẳng trên XY thì bỏ qua SVD
+    extent = world.max(axis=0) - world.min(axis=0)
+    if extent[2] > 1e-6 * max(extent[0], extent[1], 1.0):
+        centered = world - world.mean(axis=0)
+        _, _, vh = np.linalg.svd(centered, full_matrices=False)
+        normal = vh[2]
 
-    z_axis = Vector((0, 0, 1))
-    normal_vec = Vector(normal)
-    axis = normal_vec.cross(z_axis)
-    angle = normal_vec.angle(z_axis)
+        if normal[2] < 0:
+            normal = -normal
 
-    if axis.length > 1e-6 and angle > 1e-6:
-        R = Matrix.Rotation(angle, 4, axis.normalized())
-        obj.matrix_world = R @ obj.matrix_world
-        bpy.context.view_layer.update()
+        z_axis = Vector((0, 0, 1))
+        normal_vec = Vector(normal)
+        axis = normal_vec.cross(z_axis)
+        angle = normal_vec.angle(z_axis)
+
+        if axis.length > 1e-6 and angle > 1e-6:
+            R = Matrix.Rotation(angle, 4, axis.normalized())
+            matrix = R @ matrix
+            world = world @ np.array(R.to_3x3(), dtype=np.float64).T
+
+    # Hạ xuống mặt đất
+    min_corner = world.min(axis=0)
+    max_corner = world.max(axis=0)
+    matrix.translation.z -= min_corner[2]
+
+    return {
+        'obj': obj,
+        'matrix': matrix,
+        'width': max_corner[0] - min_corner[0],
+        'height': max_corner[1] - min_corner[1],
+        'min_x': min_corner[0],
+        'min_y': min_corner[1],
+        # Toạ độ XY của các đỉnh sau khi làm phẳng (dùng cho xếp theo hình dạng)
+        'points': world[:, :2],
+    }
+
+def _flatten_key(obj):
+    return (obj.as_pointer(), obj.name)
+
+
+def _mesh_fingerprint(mesh):
+    # So theo nội dung toạ độ nên bắt được cả khi chỉ di chuyển đỉnh, kể cả khi depsgraph
+    # không gửi sự kiện; lần dời origin của chính flatten_object cũng không làm mất cache
+    coords = mesh_local_coords(mesh)
+    return (mesh.as_pointer(), len(mesh.edges), len(mesh.polygons), hash(coords.tobytes()))
+
+
+def _matrix_key(matrix):
+    return tuple(round(v, 5) for row in matrix for v in row)
+
+
+def get_flattened(obj):
+    # Dùng lại cache nếu mesh chưa đổi và object vẫn ở chỗ lần xếp trước đặt
+    key = _flatten_key(obj)
+    fingerprint = _mesh_fingerprint(obj.data)
+    cached = _flatten_cache.get(key)
+    if not (cached and cached[0] == fingerprint and cached[1] == _matrix_key(obj.matrix_world)):
+        data = flatten_object(obj)
+        # Mesh có thể vừa được dời origin nên tính lại dấu vân tay sau khi làm phẳng
+        cached = (_mesh_fingerprint(obj.data), None, data)
+        _flatten_cache[key] = cached
+    data = cached[2]
+    return dict(data, matrix=data['matrix'].copy())
 
-def flatten_object_to_ground(obj):
-    mesh = obj.data
-    min_z = float('inf')
-    for v in mesh.vertices:
-        world_v = obj.matrix_world @ v.co
-        if world_v.z < min_z:
-            min_z = world_v.z
-    obj.location.z -= min_z
-
-def get_bbox_2d(obj):
-    bbox = [obj.matrix_world @ Vector(corner) for corner in obj.bound_box]
-    min_x = min(v.x for v in bbox)
-    max_x = max(v.x for v in bbox)
-    min_y = min(v.y for v in bbox)
-    max_y = max(v.y for v in bbox)
-    return min_x, max_x, min_y, max_y
-
-def flatten_and_arrange(objs, cols, spacing):
-    # Làm phẳng & thu thập dữ liệu bounding box
-    bbox_data = []
-    for obj in objs:
-        bpy.context.view_layer.objects.active = obj
-        bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='BOUNDS')
-        align_object_points_to_xy(obj)
-        flatten_object_to_ground(obj)
-        bpy.context.view_layer.update()
-
-        min_x, max_x, min_y, max_y = get_bbox_2d(obj)
-        width = max_x - min_x
-        height = max_y - min_y
-        bbox_data.append({
-            'obj': obj,
-            'width': width,
-            'height': height,
-            'min_x': min_x,
-            'min_y': min_y,
-        })
-
-    # Tự tính số hàng
-    rows = math.ceil(len(objs) / cols)
 
+def _remember_placement(bbox_data):
+    for data in bbox_data:
+        obj = data['obj']
+        cached = _flatten_cache.get(_flatten_key(obj))
+        if cached:
+            _flatten_cache[_flatten_key(obj)] = (cached[0], _matrix_key(obj.matrix_world), cached[2])
+
+
+def invalidate_flatten_cache(obj=None):
+    if obj is None:
+        _flatten_cache.clear()
+    else:
+        _flatten_cache.pop(_flatten_key(obj), None)
+
+
+@persistent
+def flatten_cache_load_handler(*args):
+    invalidate_flatten_cache()
+
+
+def _move_to(data, x, y):
+    matrix = data['matrix']
+    matrix.translation.x += x - data['min_x']
+    matrix.translation.y += y - data['min_y']
+    data['obj'].matrix_world = matrix
+
+
+def _rotate_90(data):
+    # Xoay 90° quanh Z của world: (x, y) -> (-y, x)
+    data['matrix'] = Matrix.Rotation(math.pi / 2, 4, 'Z') @ data['matrix']
+    data['min_x'], data['min_y'] = -(data['min_y'] + data['height']), data['min_x']
+    data['width'], data['height'] = data['height'], data['width']
+
+
+def arrange_grid(bbox_data, cols, spacing):
     # Bắt đầu sắp xếp
     x_offset = 0
     y_offset = 0
     col = 0
     row_max_height = 0
 
-    for i, data in enumerate(bbox_data):
-        obj = data['obj']
-        width = data['width']
-        height = data['height']
-        min_x = data['min_x']
-        min_y = data['min_y']
-
+    for data in bbox_data:
         # Vị trí mới: giữ nguyên kích thước, dịch sang đúng vị trí
-        dx = x_offset - min_x
-        dy = -y_offset - min_y
-        obj.location.x += dx
-        obj.location.y += dy
+        _move_to(data, x_offset, -y_offset)
 
         # Cập nhật offset cho object kế tiếp
-        x_offset += width + spacing
-        row_max_height = max(row_max_height, height)
+        x_offset += data['width'] + spacing
+        row_max_height = max(row_max_height, data['height'])
         col += 1
 
         # Nếu hết cột, chuyển hàng
@@ -105,13 +164,141 @@ def flatten_and_arrange(objs, cols, spacing):
             y_offset += row_max_height + spacing
             row_max_height = 0
 
+
+def arrange_on_sheets(bbox_data, sheet_width, sheet_height, spacing, allow_rotate):
+    # Trả về (tỷ lệ sử dụng từng tấm, danh sách object quá khổ)
+    sizes = [(data['width'], data['height']) for data in bbox_data]
+    placements, utilisation, oversize = pack_rectangles(
+        sizes, sheet_width, sheet_height, spacing=spacing, allow_rotate=allow_rotate)
+
+    # Khoảng hở giữa các tấm để dễ phân biệt trong viewport
+    sheet_pitch = sheet_width + max(spacing, sheet_width * 0.1)
+    oversize = list(oversize)
+    for k, (data, placement) in enumerate(zip(bbox_data, placements)):
+        if placement.rotated:
+            _rotate_90(data)
+        _move_to(data, placement.sheet * sheet_pitch + placement.x, placement.y)
+        # Xoay cho vừa chiều rộng vẫn có thể dài hơn tấm: kiểm tra cả hai chiều sau khi xoay
+        too_big = data['width'] > sheet_width + 1e-6 or data['height'] > sheet_height + 1e-6
+        if too_big and k not in oversize:
+            oversize.append(k)
+
+    return utilisation, [bbox_data[k]['obj'] for k in oversize]
+
+
+def part_outline(data):
+    # Vòng lớn nhất của các mặt hướng lên; không có thì dùng bao lồi
+    points = data['points']
+    mesh = data['obj'].data
+    if len(points) >= 3 and len(mesh.polygons):
+        normals = np.empty(len(mesh.polygons) * 3, dtype=np.float32)
+        mesh.polygons.foreach_get("normal", normals)
+        # Pháp tuyến sang world: n @ M^-1 (nghịch đảo chuyển vị, đúng cả khi scale không đều)
+        inverse = np.array(data['matrix'].to_3x3().inverted_safe(), dtype=np.float64)
+        nz = (normals.reshape(-1, 3) @ inverse)[:, 2]
+        facing = nz > 1e-6 if np.any(nz > 1e-6) else nz < -1e-6
+
+        loop_total = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get("loop_total", loop_total)
+        edge_index = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("edge_index", edge_index)
+        face_count = np.bincount(edge_index[np.repeat(facing, loop_total)], minlength=len(mesh.edges))
+        boundary = np.flatnonzero(face_count == 1)
+
+        if len(boundary):
+            edge_verts = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+            mesh.edges.foreach_get("vertices", edge_verts)
+            loops = [points[loop] for loop in chain_loops(edge_verts.reshape(-1, 2)[boundary])]
+            if loops:
+                return max(loops, key=polygon_area)
+
+    if len(points) >= 3:
+        hull = convex_hull_2d(points)
+        if len(hull) >= 3:
+            return hull
+
+    # Không có hình dạng rõ ràng: dùng hình chữ nhật footprint
+    x, y, w, h = data['min_x'], data['min_y'], data['width'], data['height']
+    return np.array([[x, y], [x + w, y], [x + w, y + h], [x, y + h]], dtype=np.float64)
+
+
+def arrange_nested(bbox_data, sheet_width, sheet_height, spacing, rotations, resolution, executor=None):
+    outlines = [part_outline(data) for data in bbox_data]
+    placements, utilisation, oversize = nest_polygons(
+        outlines, sheet_width, sheet_height, spacing=spacing, cell=resolution, rotations=rotations,
+        executor=executor)
+
+    sheet_pitch = sheet_width + max(spacing, sheet_width * 0.1)
+    for data, placement in zip(bbox_data, placements):
+        offset = Matrix.Translation((placement.sheet * sheet_pitch + placement.x, placement.y, 0.0))
+        data['obj'].matrix_world = offset @ Matrix.Rotation(placement.angle, 4, 'Z') @ data['matrix']
+
+    return utilisation, [bbox_data[k]['obj'] for k in oversize]
+
+
+def flatten_and_arrange(objs, props, executor=None):
+    # executor chỉ dùng cho kiểu xếp theo hình dạng
+    global _last_pack_report
+    # Làm phẳng & thu thập dữ liệu bounding box (chỉ tính lại object đã đổi)
+    bbox_data = [get_flattened(obj) for obj in objs]
+
+    if props.layout_mode == 'GRID':
+        arrange_grid(bbox_data, props.cols, props.spacing)
+        _remember_placement(bbox_data)
+        _last_pack_report = ([], 0)
+        return None
+
+    if props.layout_mode == 'NEST':
+        utilisation, oversize = arrange_nested(
+            bbox_data, props.sheet_width, props.sheet_height, props.spacing,
+            props.nest_rotations, props.nest_resolution, executor)
+    else:
+        utilisation, oversize = arrange_on_sheets(
+            bbox_data, props.sheet_width, props.sheet_height, props.spacing, props.allow_rotate)
+    _remember_placement(bbox_data)
+    _last_pack_report = (utilisation, len(oversize))
+    return utilisation, oversize
+
 # --- Properties ---
 class FlattenProps(bpy.types.PropertyGroup):
     def update_trigger(self, context):
+        # Xếp theo hình dạng tốn thời gian, chỉ chạy khi bấm nút
+        if self.layout_mode == 'NEST':
+            return
         selected_objs = [obj for obj in context.selected_objects if obj.type == 'MESH']
         if selected_objs:
-            flatten_and_arrange(selected_objs, self.cols, self.spacing)
+            flatten_and_arrange(selected_objs, self)
 
+    layout_mode: bpy.props.EnumProperty(
+        name="Kiểu xếp",
+        items=[
+            ('GRID', "Lưới", "Xếp theo số cột cố định"),
+            ('PACK', "Tấm phôi", "Xếp chặt lên các tấm phôi có kích thước cho trước"),
+            ('NEST', "Hình dạng", "Xếp theo đường bao thật của chi tiết trên tấm phôi"),
+        ],
+        default='GRID',
+        update=update_trigger
+    )
+    sheet_width: bpy.props.FloatProperty(
+        name="Rộng tấm", default=1220, min=1,
+        update=update_trigger
+    )
+    sheet_height: bpy.props.FloatProperty(
+        name="Dài tấm", default=2440, min=1,
+        update=update_trigger
+    )
+    allow_rotate: bpy.props.BoolProperty(
+        name="Cho phép xoay 90°", default=True,
+        update=update_trigger
+    )
+    nest_rotations: bpy.props.IntProperty(
+        name="Số góc xoay", default=4, min=1, max=16,
+        description="Số hướng thử cho mỗi chi tiết, chia đều 360°"
+    )
+    nest_resolution: bpy.props.FloatProperty(
+        name="Độ phân giải", default=5, min=0.1,
+        description="Cạnh ô lưới dùng để kiểm tra va chạm (nhỏ hơn thì chính xác hơn nhưng chậm hơn)"
+    )
     cols: bpy.props.IntProperty(
         name="Số cột", default=3, min=1,
         update=update_trigger
@@ -132,8 +319,26 @@ class OBJECT_OT_flatten_arrange(bpy.types.Operator):
         props = context.scene.flatten_props
         selected_objs = [obj for obj in context.selected_objects if obj.type == 'MESH']
         if selected_objs:
-            flatten_and_arrange(selected_objs, props.cols, props.spacing)
-            self.report({'INFO'}, "✅ Đã làm phẳng và xếp.")
+            # Pool tiến trình tạo một lần cho cả lần chạy (None ngoài Linux hoặc ít chi tiết)
+            executor = None
+            if props.layout_mode == 'NEST' and len(selected_objs) >= PARALLEL_MIN_PARTS:
+                executor = make_executor()
+            try:
+                result = flatten_and_arrange(selected_objs, props, executor)
+            finally:
+                if executor:
+                    executor.shutdown()
+            if result is None:
+                self.report({'INFO'}, "✅ Đã làm phẳng và xếp.")
+                return {'FINISHED'}
+
+            utilisation, oversize = result
+            usage = ", ".join(f"{ratio * 100:.1f}%" for ratio in utilisation)
+            if oversize:
+                names = ", ".join(obj.name for obj in oversize[:5])
+                self.report({'WARNING'}, f"⚠️ {len(oversize)} chi tiết lớn hơn tấm phôi: {names}" + (f". Sử dụng tấm: {usage}" if usage else ""))
+            else:
+                self.report({'INFO'}, f"✅ Đã xếp {len(selected_objs)} chi tiết lên {len(utilisation)} tấm (sử dụng: {usage}).")
         else:
             self.report({'WARNING'}, "⚠️ Chưa chọn object nào.")
         return {'FINISHED'}
@@ -151,10 +356,29 @@ class OBJECT_PT_flatten_panel(bpy.types.Panel):
         layout = self.layout
         props = context.scene.flatten_props
 
-        layout.prop(props, "cols")
+        layout.prop(props, "layout_mode", expand=True)
+        if props.layout_mode == 'GRID':
+            layout.prop(props, "cols")
+        else:
+            row = layout.row(align=True)
+            row.prop(props, "sheet_width")
+            row.prop(props, "sheet_height")
+            if props.layout_mode == 'PACK':
+                layout.prop(props, "allow_rotate")
+            else:
+                layout.prop(props, "nest_rotations")
+                layout.prop(props, "nest_resolution")
         layout.prop(props, "spacing")
         layout.operator("object.flatten_arrange")
 
+        utilisation, oversize = _last_pack_report
+        if props.layout_mode != 'GRID' and utilisation:
+            box = layout.box()
+            for index, ratio in enumerate(utilisation, start=1):
+                box.label(text=f"Tấm {index}: {ratio * 100:.1f}%")
+            if oversize:
+                box.label(text=f"{oversize} chi tiết quá khổ", icon='ERROR')
+
 
 # --- Đăng ký ---
 classes = (
@@ -167,11 +391,16 @@ def register():
     for cls in classes:
         bpy.utils.register_class(cls)
     bpy.types.Scene.flatten_props = bpy.props.PointerProperty(type=FlattenProps)
+    if flatten_cache_load_handler not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(flatten_cache_load_handler)
 
 def unregister():
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
     del bpy.types.Scene.flatten_props
+    if flatten_cache_load_handler in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(flatten_cache_load_handler)
+    invalidate_flatten_cache()
 
 if __name__ == "__main__":
     register()
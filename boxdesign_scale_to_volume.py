@@ -1,20 +1,24 @@
 import bpy
-import bmesh
+import math
+import numpy as np
 from mathutils import Vector
-from bpy.app.handlers import persistent
+
+from . import depsgraph_dispatcher
+from .area_utils import mesh_local_coords, set_mesh_local_coords
+from .volume_utils import data_volume, analyse_watertight, draw_watertight_report
+from .selection_tracker import get_first_selected_mesh
+from .separate_utils import separate_faces, extract_coplanar_panels
 
 updating_dimensions = False
 
+# Cache thể tích local cho bộ giải dạng đóng: con trỏ mesh -> (dấu vân tay nội dung, thể tích)
+_local_volume_cache = {}
+
 def calculate_volume(obj):
-    bm = bmesh.new()
-    bm.from_mesh(obj.data)
     # Kiểm tra xem mesh có kín không
-    if not bm.is_valid or any(e.is_boundary for e in bm.edges):
-        bm.free()
+    if not analyse_watertight(obj.data).is_watertight:
         return 0.0
-    volume = bm.calc_volume()
-    bm.free()
-    return volume
+    return data_volume(obj)
 
 def get_base_dimensions(obj):
     orig_scale = obj.scale.copy()
@@ -25,10 +29,68 @@ def get_base_dimensions(obj):
     bpy.context.view_layer.update()
     return base_dim
 
+def mesh_fingerprint(mesh, coords):
+    # So theo nội dung (toạ độ đỉnh + topo) nên bắt được cả khi chỉ di chuyển đỉnh,
+    # không phụ thuộc vào việc depsgraph có gửi sự kiện hay không
+    return len(mesh.vertices), len(mesh.loops), len(mesh.polygons), hash(coords.tobytes())
+
+def get_local_volume_and_dimensions(obj):
+    mesh = obj.data
+    coords = mesh_local_coords(mesh)
+    dimensions = Vector(np.ptp(coords, axis=0)) if len(coords) else Vector((0, 0, 0))
+    key = mesh.as_pointer()
+    fingerprint = mesh_fingerprint(mesh, coords)
+    cached = _local_volume_cache.get(key)
+    if cached and cached[0] == fingerprint:
+        return cached[1], dimensions
+    volume = calculate_volume(obj)
+    _local_volume_cache[key] = (fingerprint, volume)
+    return volume, dimensions
+
+def apply_scale_to_mesh(obj, scale):
+    # Thay cho transform_apply: nhân toạ độ đỉnh với scale trong một lần foreach_set
+    mesh = obj.data
+    if mesh.users > 1:
+        # Mesh dùng chung: ghi vào đỉnh sẽ làm méo các object khác nên chỉ đặt scale của object
+        obj.scale = scale
+        return True
+    coords = mesh_local_coords(mesh)
+    key = mesh.as_pointer()
+    cached = _local_volume_cache.get(key)
+    set_mesh_local_coords(mesh, coords * np.array(scale, dtype=np.float64))
+    obj.scale = Vector((1, 1, 1))
+
+    # Thể tích tỷ lệ đúng với tích các hệ số scale nên cập nhật cache luôn,
+    # kèm dấu vân tay của toạ độ sau khi scale
+    if cached and cached[0] == mesh_fingerprint(mesh, coords):
+        scaled = mesh_local_coords(mesh)
+        _local_volume_cache[key] = (mesh_fingerprint(mesh, scaled), cached[1] * abs(scale[0] * scale[1] * scale[2]))
+    else:
+        _local_volume_cache.pop(key, None)
+    return True
+
+def apply_object_scale(obj, scale, closed_form):
+    if closed_form:
+        return apply_scale_to_mesh(obj, scale)
+    obj.scale = scale
+    bpy.context.view_layer.update()
+    # Áp dụng tỷ lệ sau khi thay đổi
+    bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
+    return True
+
+def use_closed_form_solver():
+    return getattr(bpy.context.scene, "scale_solver", 'CLOSED_FORM') == 'CLOSED_FORM'
+
+def get_base_volume_and_dimensions(obj, closed_form):
+    if closed_form:
+        return get_local_volume_and_dimensions(obj)
+    return calculate_volume(obj), get_base_dimensions(obj)
+
 def scale_object_to_dims(obj, width, height, target_volume_liters):
     target_volume = target_volume_liters * 1_000_000  # Chuyển từ lít sang mm³
-    base_volume = calculate_volume(obj)  # Sử dụng thể tích thực
-    base_dim = get_base_dimensions(obj)
+    closed_form = use_closed_form_solver()
+    # Sử dụng thể tích thực
+    base_volume, base_dim = get_base_volume_and_dimensions(obj, closed_form)
     base_width, base_depth, base_height = base_dim.x, base_dim.y, base_dim.z
 
     if base_volume == 0 or base_width == 0 or base_height == 0:
@@ -41,16 +103,13 @@ def scale_object_to_dims(obj, width, height, target_volume_liters):
     if scale_y <= 0:
         return False
 
-    obj.scale = Vector((scale_x, scale_y, scale_z))
-    bpy.context.view_layer.update()
-    # Áp dụng tỷ lệ sau khi thay đổi
-    bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
-    return True
+    return apply_object_scale(obj, Vector((scale_x, scale_y, scale_z)), closed_form)
 
 def scale_object_to_volume_only(obj, target_volume_liters):
     target_volume = target_volume_liters * 1_000_000  # Chuyển từ lít sang mm³
-    base_volume = calculate_volume(obj)  # Sử dụng thể tích thực
-    base_dim = get_base_dimensions(obj)
+    closed_form = use_closed_form_solver()
+    # Sử dụng thể tích thực
+    base_volume, base_dim = get_base_volume_and_dimensions(obj, closed_form)
     base_width, base_depth, base_height = base_dim.x, base_dim.y, base_dim.z
     if base_volume == 0 or base_width == 0 or base_height == 0:
         return False
@@ -62,20 +121,15 @@ def scale_object_to_volume_only(obj, target_volume_liters):
     if scale_y <= 0:
         return False
 
-    obj.scale.y = scale_y
-    bpy.context.view_layer.update()
-    # Áp dụng tỷ lệ sau khi thay đổi
-    bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
-    return True
+    return apply_object_scale(obj, Vector((scale_x, scale_y, scale_z)), closed_form)
 
 def update_scene_dimensions_from_object(scene):
     global updating_dimensions
     if updating_dimensions:
         return
-    objs = [obj for obj in scene.objects if obj.select_get() and obj.type == 'MESH']
-    if not objs:
+    obj = get_first_selected_mesh()
+    if not obj:
         return
-    obj = objs[0]
     dim = obj.dimensions
 
     updating_dimensions = True
@@ -85,8 +139,7 @@ def update_scene_dimensions_from_object(scene):
         scene.height = dim.z
     updating_dimensions = False
 
-@persistent
-def depsgraph_update_handler(scene, depsgraph):
+def sync_dimensions_from_events(scene, events):
     update_scene_dimensions_from_object(scene)
 
 def on_dimension_prop_update(self, context):
@@ -95,10 +148,9 @@ def on_dimension_prop_update(self, context):
         return
 
     scene = context.scene
-    objs = [obj for obj in scene.objects if obj.select_get() and obj.type == 'MESH']
-    if not objs:
+    obj = get_first_selected_mesh(context)
+    if not obj:
         return
-    obj = objs[0]
 
     updating_dimensions = True
     success = scale_object_to_dims(obj, scene.width, scene.height, scene.target_volume)
@@ -112,10 +164,9 @@ def on_volume_prop_update(self, context):
         return
 
     scene = context.scene
-    objs = [obj for obj in scene.objects if obj.select_get() and obj.type == 'MESH']
-    if not objs:
+    obj = get_first_selected_mesh(context)
+    if not obj:
         return
-    obj = objs[0]
 
     updating_dimensions = True
     success = scale_object_to_volume_only(obj, scene.target_volume)
@@ -131,11 +182,10 @@ class OBJECT_OT_UpdateScale(bpy.types.Operator):
     def execute(self, context):
         scene = context.scene
         # Kiểm tra xem có đối tượng mesh được chọn không
-        objs = [obj for obj in scene.objects if obj.select_get() and obj.type == 'MESH']
-        if not objs:
+        obj = get_first_selected_mesh(context)
+        if not obj:
             self.report({'ERROR'}, "Không có đối tượng mesh nào được chọn.")
             return {'CANCELLED'}
-        obj = objs[0]
 
         # Kiểm tra giá trị target_volume
         if scene.target_volume <= 0:
@@ -143,13 +193,9 @@ class OBJECT_OT_UpdateScale(bpy.types.Operator):
             return {'CANCELLED'}
 
         # Kiểm tra mesh có kín không
-        bm = bmesh.new()
-        bm.from_mesh(obj.data)
-        if any(e.is_boundary for e in bm.edges):
-            bm.free()
+        if not analyse_watertight(obj.data).is_watertight:
             self.report({'ERROR'}, "Đối tượng mesh phải là hình khối kín để tính thể tích.")
             return {'CANCELLED'}
-        bm.free()
 
         global updating_dimensions
         updating_dimensions = True
@@ -161,6 +207,7 @@ class OBJECT_OT_UpdateScale(bpy.types.Operator):
             return {'CANCELLED'}
 
         # Cập nhật lại chiều rộng và chiều cao trong UI
+        context.view_layer.update()
         update_scene_dimensions_from_object(scene)
         self.report({'INFO'}, "Đã cập nhật chiều sâu thành công.")
         return {'FINISHED'}
@@ -169,56 +216,61 @@ class OBJECT_OT_UpdateScale(bpy.types.Operator):
 class SeparateFacesOperator(bpy.types.Operator):
     bl_idname = "mesh.separate_faces_button"
     bl_label = "Tách Face"
+    bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
         obj = context.active_object
 
         if obj and obj.type == 'MESH':
-            # Lưu tên object ban đầu
-            original_name = obj.name
-            
-            # Chuyển sang Edit Mode
-            bpy.ops.object.mode_set(mode='EDIT')
-            
-            # Tạo BMesh để xử lý mesh
-            bm = bmesh.from_edit_mesh(obj.data)
-            
-            # Lưu danh sách các mặt
-            faces = [face for face in bm.faces]
-            
-            # Tách từng mặt thành object riêng
-            for i, face in enumerate(faces):
-                bm.faces.ensure_lookup_table()
-                # Chọn mặt hiện tại
-                for f in bm.faces:
-                    f.select = False
-                face.select = True
-                
-                # Tách mặt được chọn
-                bpy.ops.mesh.separate(type='SELECTED')
-            
-            # Cập nhật mesh
-            bmesh.update_edit_mesh(obj.data)
-            
-            # Chuyển về Object Mode
-            bpy.ops.object.mode_set(mode='OBJECT')
-            
-            # Xóa object ban đầu nếu nó còn tồn tại và không có mặt
-            bpy.ops.object.select_all(action='DESELECT')
-            obj.select_set(True)
-            bpy.context.view_layer.objects.active = obj
-            bm = bmesh.new()
-            bm.from_mesh(obj.data)
-            if not bm.faces:
-                bpy.ops.object.delete()
-            
-            # Giải phóng BMesh
-            bm.free()
+            if not obj.data.polygons:
+                self.report({'WARNING'}, "Mesh không có mặt nào để tách")
+                return {'CANCELLED'}
+            # Tách tất cả các mặt trong một lượt (đọc mesh một lần, tạo mesh mới bằng foreach_set)
+            new_objects = separate_faces(obj)
+            self.report({'INFO'}, f"Đã tách {len(new_objects)} mặt")
         else:
             self.report({'WARNING'}, "Vui lòng chọn một object Mesh")
         
         return {'FINISHED'}
 
+class ExtractPanelsOperator(bpy.types.Operator):
+    bl_idname = "mesh.extract_coplanar_panels"
+    bl_label = "Tách tấm"
+    bl_description = "Gom các mặt cùng mặt phẳng và liền nhau thành từng tấm cắt riêng"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    angle_tolerance: bpy.props.FloatProperty(
+        name="Dung sai góc", default=math.radians(1.0), min=0.0, max=math.radians(30.0),
+        subtype='ANGLE'
+    )
+    distance_tolerance: bpy.props.FloatProperty(
+        name="Dung sai mặt phẳng", default=0.01, min=0.0
+    )
+    min_area: bpy.props.FloatProperty(
+        name="Diện tích tối thiểu", default=0.0, min=0.0,
+        description="Bỏ qua các tấm nhỏ hơn (ví dụ dải cạnh của Solidify)"
+    )
+    keep_source: bpy.props.BoolProperty(
+        name="Giữ object gốc", default=True
+    )
+
+    def execute(self, context):
+        obj = context.active_object
+        if not obj or obj.type != 'MESH':
+            self.report({'WARNING'}, "Vui lòng chọn một object Mesh")
+            return {'CANCELLED'}
+
+        panels = extract_coplanar_panels(
+            obj, context.evaluated_depsgraph_get(), self.angle_tolerance, self.distance_tolerance,
+            self.min_area, self.keep_source,
+        )
+        if not panels:
+            self.report({'WARNING'}, "Không tìm thấy tấm nào")
+            return {'CANCELLED'}
+        total_area = sum(panel["panel_area"] for panel in panels)
+        self.report({'INFO'}, f"Đã tách {len(panels)} tấm, tổng diện tích {total_area:.1f}")
+        return {'FINISHED'}
+
 class ScaleVolumePanel(bpy.types.Panel):
     bl_label = "Scale Volume"
     bl_idname = "PT_ScaleVolumePanel"
@@ -233,11 +285,15 @@ class ScaleVolumePanel(bpy.types.Panel):
         layout.prop(scene, "width", text="Chiều rộng (mm)")
         layout.prop(scene, "height", text="Chiều cao (mm)")
         layout.prop(scene, "target_volume", text="Dung tích (L)")
+        layout.prop(scene, "scale_solver", text="Bộ giải")
         layout.operator("object.update_scale", text="Cập nhật")
         obj = context.active_object
+        if obj and obj.type == 'MESH':
+            draw_watertight_report(layout, analyse_watertight(obj.data))
         row = layout.row()
         if obj and obj.type == 'MESH':
             row.operator("mesh.separate_faces_button", text="Tách Face")
+            row.operator("mesh.extract_coplanar_panels", text="Tách tấm")
         else:
             row.label(text="Chọn một object Mesh")
 
@@ -260,14 +316,25 @@ def register():
         min=0.001,
         update=on_volume_prop_update
     )
+    bpy.types.Scene.scale_solver = bpy.props.EnumProperty(
+        name="Scale Solver",
+        items=[
+            ('CLOSED_FORM', "Nhanh", "Tính scale trực tiếp từ thể tích đã cache, ghi thẳng vào mesh"),
+            ('APPLY', "transform_apply", "Cách cũ: đặt scale, view_layer.update() rồi transform_apply"),
+        ],
+        default='CLOSED_FORM',
+    )
 
     bpy.utils.register_class(ScaleVolumePanel)
     bpy.utils.register_class(OBJECT_OT_UpdateScale)
 
-    if depsgraph_update_handler not in bpy.app.handlers.depsgraph_update_post:
-        bpy.app.handlers.depsgraph_update_post.append(depsgraph_update_handler)
+    depsgraph_dispatcher.subscribe(
+        "scale_volume_dimensions", sync_dimensions_from_events,
+        {'SCENE', 'ACTIVE', 'GEOMETRY', 'TRANSFORM'}, debounce=0.05, collect_ids=False,
+    )
         
     bpy.utils.register_class(SeparateFacesOperator)
+    bpy.utils.register_class(ExtractPanelsOperator)
 
 def unregister():
     bpy.utils.unregister_class(ScaleVolumePanel)
@@ -275,7 +342,9 @@ def unregister():
     del bpy.types.Scene.width
     del bpy.types.Scene.height
     del bpy.types.Scene.target_volume
+    del bpy.types.Scene.scale_solver
+    _local_volume_cache.clear()
     bpy.utils.unregister_class(SeparateFacesOperator)
+    bpy.utils.unregister_class(ExtractPanelsOperator)
 
-    if depsgraph_update_handler in bpy.app.handlers.depsgraph_update_post:
-        bpy.app.handlers.depsgraph_update_post.remove(depsgraph_update_handler)
+    depsgraph_dispatcher.unsubscribe("scale_volume_dimensions")
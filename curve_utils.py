@@ -0,0 +1,111 @@
+import numpy as np
+
+# Các hàm ở đây chỉ dùng NumPy: tính lại knot và đánh giá NURBS giống Blender
+
+
+def nurbs_knots(count, order, cyclic=False, endpoint=False, bezier=False):
+    # Giống calculate_knots của Blender
+    repeat_inner = order - 1 if bezier else 1
+    if endpoint:
+        head = order - (1 if cyclic else 0)
+    else:
+        head = min(2, repeat_inner) if bezier else 1
+    tail = 2 * order - 1 if cyclic else (order if endpoint else 0)
+    knot_count = count + order + (order - 1 if cyclic else 0)
+
+    knots = np.zeros(knot_count)
+    current = 0.0
+    offset = 1 if endpoint and cyclic else 0
+    if offset:
+        knots[0] = current
+        current += 1.0
+    r = head
+    for i in range(offset, knot_count - tail):
+        knots[i] = current
+        r -= 1
+        if r == 0:
+            current += 1.0
+            r = repeat_inner
+    tail_index = knot_count - tail
+    for i in range(tail):
+        knots[tail_index + i] = current + (knots[i] - knots[0])
+    return knots
+
+
+def evaluate_nurbs(points, weights, knots, order, params):
+    # de Boor, vector hoá theo params
+    degree = order - 1
+    homogeneous = np.column_stack((points * weights[:, None], weights))
+    span = np.searchsorted(knots, params, side='right') - 1
+    span = np.clip(span, degree, len(points) - 1)
+
+    index = span[:, None] - degree + np.arange(order)[None, :]
+    d = homogeneous[index]
+    for r in range(1, order):
+        for j in range(degree, r - 1, -1):
+            i = span - degree + j
+            left = knots[i]
+            denominator = knots[i + degree + 1 - r] - left
+            with np.errstate(divide='ignore', invalid='ignore'):
+                alpha = np.where(denominator > 0, (params - left) / denominator, 0.0)
+            d[:, j] = (1.0 - alpha)[:, None] * d[:, j - 1] + alpha[:, None] * d[:, j]
+    result = d[:, degree]
+    return result[:, :3] / result[:, 3:4]
+
+
+def sample_nurbs(points, weights, order, cyclic=False, endpoint=False, bezier=False,
+                 tolerance=0.01, max_depth=16):
+    # Chia đôi đồng loạt các đoạn có sai số dây cung vượt tolerance
+    order = max(2, min(order, len(points)))
+    if cyclic:
+        points = np.concatenate((points, points[:order - 1]))
+        weights = np.concatenate((weights, weights[:order - 1]))
+    knots = nurbs_knots(len(points) - (order - 1 if cyclic else 0), order, cyclic, endpoint, bezier)
+    start = knots[order - 1]
+    end = knots[len(points)]
+
+    breaks = np.unique(knots[(knots >= start) & (knots <= end)])
+    params = np.unique(np.concatenate([np.linspace(a, b, 5) for a, b in zip(breaks[:-1], breaks[1:])]))
+    samples = evaluate_nurbs(points, weights, knots, order, params)
+
+    for _ in range(max_depth):
+        middle = (params[:-1] + params[1:]) / 2.0
+        curve = evaluate_nurbs(points, weights, knots, order, middle)
+        chord = (samples[:-1] + samples[1:]) / 2.0
+        split = np.linalg.norm(curve - chord, axis=1) > tolerance
+        if not split.any():
+            break
+        params = np.insert(params, np.flatnonzero(split) + 1, middle[split])
+        samples = np.insert(samples, np.flatnonzero(split) + 1, curve[split], axis=0)
+
+    if cyclic and len(samples) > 1:
+        # Điểm cuối trùng điểm đầu, phần tử <polygon> tự khép kín
+        samples = samples[:-1]
+    return samples
+
+
+def flatten_bezier(points, left, right, closed=False, tolerance=0.01):
+    # Số đoạn mỗi đoạn cong: n = sqrt(0.75 * L / tol), L là chặn trên đạo hàm bậc hai
+    if closed:
+        ends = np.concatenate((points[1:], points[:1]))
+        ends_left = np.concatenate((left[1:], left[:1]))
+        starts, starts_right = points, right
+    else:
+        starts, starts_right, ends_left, ends = points[:-1], right[:-1], left[1:], points[1:]
+    if not len(starts):
+        return points.copy()
+
+    second = np.maximum(
+        np.linalg.norm(starts - 2.0 * starts_right + ends_left, axis=1),
+        np.linalg.norm(starts_right - 2.0 * ends_left + ends, axis=1),
+    )
+    counts = np.maximum(1, np.ceil(np.sqrt(0.75 * second / max(tolerance, 1e-12)))).astype(np.int64)
+    segment = np.repeat(np.arange(len(starts)), counts)
+    t = (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)) / counts[segment]
+    t = t[:, None]
+    u = 1.0 - t
+    samples = (u ** 3 * starts[segment] + 3.0 * u * u * t * starts_right[segment]
+               + 3.0 * u * t * t * ends_left[segment] + t ** 3 * ends[segment])
+    if not closed:
+        samples = np.concatenate((samples, points[-1:]))
+    return samples
@@ -0,0 +1,259 @@
+import bpy
+import time
+import traceback
+from bpy.app.handlers import persistent
+
+# Các loại sự kiện mà subscriber có thể đăng ký
+EVENT_TYPES = {'OBJECT', 'GEOMETRY', 'TRANSFORM', 'SCENE', 'ACTIVE'}
+
+# name -> _Subscriber, sắp theo priority (nhỏ chạy trước)
+_subscribers = {}
+# name -> [số lần gọi, tổng thời gian (s), thời gian lớn nhất (s)]
+_stats = {}
+_active_pointer = None
+
+DISPATCH_STATS_KEY = "<dispatch>"
+
+
+# id_type -> tên collection trong bpy.data, dùng để tìm lại ID khi timer debounce chạy
+_ID_COLLECTIONS = {
+    'OBJECT': "objects",
+    'MESH': "meshes",
+    'CURVE': "curves",
+    'MATERIAL': "materials",
+    'COLLECTION': "collections",
+    'CAMERA': "cameras",
+    'LIGHT': "lights",
+}
+
+_ID_FIELDS = ("object_ids", "geometry_ids", "transform_ids")
+
+
+class DepsgraphEvents:
+    __slots__ = (
+        "object_ids", "geometry_ids", "transform_ids",
+        "object_updated", "geometry_updated", "transform_updated",
+        "scene_updated", "active_changed", "view_layer",
+    )
+
+    def __init__(self, view_layer=None):
+        self.object_ids = []
+        self.geometry_ids = []
+        self.transform_ids = []
+        # Cờ riêng: subscriber không nhận ID (collect_ids=False) vẫn biết loại sự kiện
+        self.object_updated = False
+        self.geometry_updated = False
+        self.transform_updated = False
+        self.scene_updated = False
+        self.active_changed = False
+        self.view_layer = view_layer
+
+    def types(self):
+        found = set()
+        if self.object_updated:
+            found.add('OBJECT')
+        if self.geometry_updated:
+            found.add('GEOMETRY')
+        if self.transform_updated:
+            found.add('TRANSFORM')
+        if self.scene_updated:
+            found.add('SCENE')
+        if self.active_changed:
+            found.add('ACTIVE')
+        return found
+
+
+def _id_key(id_data):
+    return id_data.as_pointer(), id_data.id_type, id_data.name
+
+
+def _lookup_id(key):
+    # None nếu ID đã bị xoá hoặc thay bằng ID khác
+    pointer, id_type, name = key
+    collection = getattr(bpy.data, _ID_COLLECTIONS.get(id_type, ""), None)
+    if collection is None:
+        return None
+    id_data = collection.get(name)
+    if id_data is None or id_data.as_pointer() != pointer:
+        return None
+    return id_data
+
+
+class _PendingEvents:
+    # Chỉ giữ khoá ID: undo/redo có thể giải phóng ID trước khi timer chạy
+    __slots__ = ("collect_ids", "keys", "flags")
+
+    def __init__(self, collect_ids):
+        self.collect_ids = collect_ids
+        # Dict giữ thứ tự thêm vào và bỏ trùng
+        self.keys = {name: {} for name in _ID_FIELDS}
+        self.flags = dict.fromkeys(
+            ("object_updated", "geometry_updated", "transform_updated", "scene_updated", "active_changed"), False)
+
+    def add(self, events):
+        for flag in self.flags:
+            self.flags[flag] |= getattr(events, flag)
+        if self.collect_ids:
+            for name in _ID_FIELDS:
+                keys = self.keys[name]
+                for id_data in getattr(events, name):
+                    keys.setdefault(_id_key(id_data), None)
+
+    def resolve(self, view_layer):
+        events = DepsgraphEvents(view_layer)
+        for flag, value in self.flags.items():
+            setattr(events, flag, value)
+        for name in _ID_FIELDS:
+            found = (_lookup_id(key) for key in self.keys[name])
+            setattr(events, name, [id_data for id_data in found if id_data is not None])
+        return events
+
+
+class _Subscriber:
+    __slots__ = ("name", "callback", "events", "debounce", "priority", "collect_ids", "pending", "timer")
+
+    def __init__(self, name, callback, events, debounce, priority, collect_ids):
+        self.name = name
+        self.callback = callback
+        self.events = events
+        self.debounce = debounce
+        self.priority = priority
+        self.collect_ids = collect_ids
+        self.pending = None
+        self.timer = None
+
+
+def subscribe(name, callback, events, debounce=None, priority=0, collect_ids=True):
+    # debounce=None gọi ngay trong handler; collect_ids=False chỉ báo "có thay đổi"
+    unknown = set(events) - EVENT_TYPES
+    if unknown:
+        raise ValueError(f"Loại sự kiện không hợp lệ: {unknown}")
+    unsubscribe(name)
+    _subscribers[name] = _Subscriber(name, callback, frozenset(events), debounce, priority, collect_ids)
+    ordered = sorted(_subscribers.values(), key=lambda sub: sub.priority)
+    _subscribers.clear()
+    _subscribers.update((sub.name, sub) for sub in ordered)
+    _stats.setdefault(name, [0, 0.0, 0.0])
+
+
+def unsubscribe(name):
+    sub = _subscribers.pop(name, None)
+    if sub and sub.timer and bpy.app.timers.is_registered(sub.timer):
+        bpy.app.timers.unregister(sub.timer)
+
+
+def _record(name, elapsed):
+    stat = _stats.setdefault(name, [0, 0.0, 0.0])
+    stat[0] += 1
+    stat[1] += elapsed
+    stat[2] = max(stat[2], elapsed)
+
+
+def _call(sub, scene, events):
+    start = time.perf_counter()
+    try:
+        sub.callback(scene, events)
+    except Exception:
+        print(f"[depsgraph_dispatcher] Lỗi trong subscriber '{sub.name}':")
+        traceback.print_exc()
+    _record(sub.name, time.perf_counter() - start)
+
+
+def _make_flush(sub):
+    def flush():
+        sub.timer = None
+        pending, sub.pending = sub.pending, None
+        if pending is None or _subscribers.get(sub.name) is not sub:
+            return None
+        _call(sub, bpy.context.scene, pending.resolve(bpy.context.view_layer))
+        return None
+    return flush
+
+
+def collect_events(depsgraph):
+    global _active_pointer
+    view_layer = depsgraph.view_layer
+    events = DepsgraphEvents(view_layer)
+    for update in depsgraph.updates:
+        id_data = update.id.original
+        if isinstance(id_data, bpy.types.Scene):
+            events.scene_updated = True
+            continue
+        if isinstance(id_data, bpy.types.Object):
+            events.object_ids.append(id_data)
+            events.object_updated = True
+        if update.is_updated_geometry:
+            events.geometry_ids.append(id_data)
+            events.geometry_updated = True
+        if update.is_updated_transform:
+            events.transform_ids.append(id_data)
+            events.transform_updated = True
+
+    active = view_layer.objects.active
+    active_pointer = active.as_pointer() if active else None
+    if active_pointer != _active_pointer:
+        _active_pointer = active_pointer
+        events.active_changed = True
+    return events
+
+
+@persistent
+def depsgraph_dispatch_handler(scene, depsgraph):
+    start = time.perf_counter()
+    events = collect_events(depsgraph)
+    found = events.types()
+    if found:
+        for sub in list(_subscribers.values()):
+            if not (sub.events & found):
+                continue
+            if sub.debounce is None:
+                _call(sub, scene, events)
+                continue
+            if sub.pending is None:
+                sub.pending = _PendingEvents(sub.collect_ids)
+            sub.pending.add(events)
+            if sub.timer is None:
+                sub.timer = _make_flush(sub)
+                bpy.app.timers.register(sub.timer, first_interval=sub.debounce)
+    _record(DISPATCH_STATS_KEY, time.perf_counter() - start)
+
+
+@persistent
+def depsgraph_dispatch_load_handler(*args):
+    global _active_pointer
+    _active_pointer = None
+    for sub in _subscribers.values():
+        sub.pending = None
+
+
+def get_stats():
+    # (tên, số lần gọi, tổng ms, lớn nhất ms), sắp theo tổng thời gian
+    rows = [(name, calls, total * 1000, peak * 1000) for name, (calls, total, peak) in _stats.items()]
+    return sorted(rows, key=lambda row: row[2], reverse=True)
+
+
+def reset_stats():
+    for stat in _stats.values():
+        stat[:] = [0, 0.0, 0.0]
+
+
+def print_stats():
+    print("[depsgraph_dispatcher] subscriber: số lần gọi / tổng ms / lớn nhất ms")
+    for name, calls, total_ms, peak_ms in get_stats():
+        print(f"  {name:<32} {calls:>8} {total_ms:>10.2f} {peak_ms:>8.2f}")
+
+
+def register():
+    if depsgraph_dispatch_handler not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(depsgraph_dispatch_handler)
+    if depsgraph_dispatch_load_handler not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(depsgraph_dispatch_load_handler)
+
+
+def unregister():
+    if depsgraph_dispatch_handler in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(depsgraph_dispatch_handler)
+    if depsgraph_dispatch_load_handler in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(depsgraph_dispatch_load_handler)
+    for name in list(_subscribers):
+        unsubscribe(name)
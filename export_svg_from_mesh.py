@@ -9,11 +9,233 @@ bl_info = {
 }
 
 import bpy
-import bmesh
 import os
-from bpy.props import StringProperty, BoolProperty
+from collections import namedtuple
+from contextlib import ExitStack
+import numpy as np
+from bpy.props import StringProperty, BoolProperty, EnumProperty, FloatProperty
 from bpy_extras.io_utils import ExportHelper
-from mathutils import Vector
+
+from .area_utils import mesh_triangle_indices, mesh_local_coords
+from .loop_utils import (
+    triangle_islands, island_boundary_edges, chain_loops, merge_collinear, simplify_closed_loop,
+    nest_loops, offset_loops,
+)
+from .curve_utils import sample_nurbs, flatten_bezier
+from .svg_utils import (
+    SvgStreamWriter, format_loop, format_points, format_bezier, format_uses, view_projection,
+    axis_view_projection, project_coords, merge_svg_layers, SvgWriteError,
+)
+
+
+FILL_STYLE = 'fill="#b3b3b3" stroke="none"'
+LINE_STYLE = 'fill="none" stroke="#b3b3b3" stroke-width="0.2mm" vector-effect="non-scaling-stroke"'
+# Đường cắt laser: chỉ có nét, không tô
+CUT_STYLE = 'fill="none" stroke="#ff0000" stroke-width="0.1mm" vector-effect="non-scaling-stroke"'
+
+# Chế độ đường cắt: bề rộng kerf (mm), kiểu nối góc 'MITER'/'ROUND', dung sai cung tròn (mm)
+CutLines = namedtuple("CutLines", "kerf join tolerance")
+
+
+VIEW_ITEMS = [
+    ('CURRENT', "Current", "Current orthographic viewport"),
+    ('TOP', "Top", ""),
+    ('FRONT', "Front", ""),
+    ('RIGHT', "Right", ""),
+    ('BOTTOM', "Bottom", ""),
+    ('BACK', "Back", ""),
+    ('LEFT', "Left", ""),
+]
+
+
+def collect_object_shapes(obj, depsgraph, curve_tolerance=0.01):
+    # Đọc hình học một lần (local, chưa chiếu) để dùng cho mọi view
+    shapes = []
+    if is_vertex_instancer(obj):
+        eval_obj = obj.evaluated_get(depsgraph)
+        coords = mesh_local_coords(eval_obj.to_mesh())
+        eval_obj.to_mesh_clear()
+        children = [
+            (np.array(child.matrix_world, dtype=np.float64), collect_object_shapes(child, depsgraph, curve_tolerance))
+            for child in obj.children if child.type == 'MESH'
+        ]
+        if len(coords) and children:
+            shapes.append(('INSTANCES', coords, children))
+
+    elif obj.type == 'MESH':
+        eval_obj = obj.evaluated_get(depsgraph)
+        mesh = eval_obj.to_mesh()
+        tris = mesh_triangle_indices(mesh)
+        coords = mesh_local_coords(mesh)
+        eval_obj.to_mesh_clear()
+
+        # Island theo tam giác chung cạnh, cạnh biên và nối vòng đều tuyến tính
+        islands = triangle_islands(tris)
+        for edges in island_boundary_edges(tris, islands).values():
+            loops = chain_loops(edges)
+            if loops:
+                shapes.append(('LOOPS', coords, loops))
+
+    elif obj.type == 'CURVE':
+        # Dung sai (mm, world) đổi về local theo scale lớn nhất của object
+        scale = max(abs(v) for v in obj.matrix_world.to_scale()) or 1.0
+        for spline in obj.data.splines:
+            if spline.type == 'BEZIER':
+                count = len(spline.bezier_points)
+                if not count:
+                    continue
+                arrays = []
+                for attribute in ("co", "handle_left", "handle_right"):
+                    values = np.empty(count * 3, dtype=np.float32)
+                    spline.bezier_points.foreach_get(attribute, values)
+                    arrays.append(values.reshape(-1, 3).astype(np.float64))
+                shapes.append(('BEZIER', arrays, spline.use_cyclic_u))
+                continue
+
+            co = np.empty(len(spline.points) * 4, dtype=np.float32)
+            spline.points.foreach_get("co", co)
+            co = co.reshape(-1, 4).astype(np.float64)
+            if not len(co):
+                continue
+            if spline.type == 'NURBS' and len(co) > 2:
+                points = sample_nurbs(
+                    co[:, :3], co[:, 3], spline.order_u, cyclic=spline.use_cyclic_u,
+                    endpoint=spline.use_endpoint_u, bezier=spline.use_bezier_u,
+                    tolerance=curve_tolerance / scale,
+                )
+            else:
+                # Spline POLY là các đoạn thẳng: giữ nguyên điểm là chính xác
+                points = co[:, :3]
+            shapes.append(('SPLINE', points, spline.use_cyclic_u))
+    return shapes
+
+
+def is_vertex_instancer(obj):
+    return obj.type == 'MESH' and obj.instance_type == 'VERTS' and any(child.type == 'MESH' for child in obj.children)
+
+
+def outline_groups(loops, cut=None, inverted=False):
+    # Đường cắt: biên ngoài dời ra, lỗ dời vào nửa kerf; inverted đảo chiều cho hình lỗ
+    groups = [[loops[outer]] + [loops[hole] for hole in holes] for outer, holes in nest_loops(loops)]
+    if cut is None or cut.kerf <= 0:
+        return groups
+    half = cut.kerf / 2.0 * (-1.0 if inverted else 1.0)
+    distances = [half if position == 0 else -half for group in groups for position in range(len(group))]
+    shifted = offset_loops([loop for group in groups for loop in group], distances, cut.join,
+                           arc_tolerance=cut.tolerance)
+    result = []
+    for group in groups:
+        result.append(shifted[:len(group)])
+        shifted = shifted[len(group):]
+    return result
+
+
+def group_path_data(group):
+    return " ".join(format_loop(np.concatenate((points, points[:1]))) for points in group)
+
+
+def write_instances(svg, coords, children, projection, matrix_world, cut=None, mask_id=None):
+    # Mesh con ghi một lần trong <defs>, mỗi đỉnh chỉ là một <use> dời đi
+    offsets = project_coords(coords, projection, matrix_world) - project_coords(np.zeros((1, 3)), projection, matrix_world)
+    shape_ids = []
+    for child_matrix, child_shapes in children:
+        loops = []
+        for kind, child_coords, data in child_shapes:
+            if kind == 'LOOPS':
+                projected = project_coords(child_coords, projection, child_matrix)
+                loops.extend(projected[loop] for loop in data)
+        if not loops:
+            continue
+        loops = [loop for group in outline_groups(loops, cut, inverted=True) for loop in group]
+        low = np.min([points.min(axis=0) for points in loops], axis=0)
+        high = np.max([points.max(axis=0) for points in loops], axis=0)
+        svg.update_bounds(np.concatenate((offsets + low, offsets + high)))
+
+        shape_id = svg.new_id("hole")
+        svg.write(f'<defs><path id="{shape_id}" d="{group_path_data(loops)}" fill-rule="evenodd"/></defs>')
+        shape_ids.append(shape_id)
+    if not shape_ids:
+        return 0
+
+    uses = "\n".join(format_uses(shape_id, offsets) for shape_id in shape_ids)
+    if cut is not None or mask_id is None:
+        svg.write(f'<g {CUT_STYLE if cut is not None else LINE_STYLE}>\n{uses}\n</g>')
+    else:
+        # Vùng trắng giữ lại tấm, các lỗ tô đen bị khoét đi
+        x, y = svg.min - 1.0
+        width, height = svg.max - svg.min + 2.0
+        svg.write(
+            f'<mask id="{mask_id}" maskUnits="userSpaceOnUse" x="{x:.4f}" y="{y:.4f}" width="{width:.4f}" height="{height:.4f}">\n'
+            f'<rect x="{x:.4f}" y="{y:.4f}" width="{width:.4f}" height="{height:.4f}" fill="#ffffff"/>\n'
+            f'<g fill="#000000" stroke="none">\n{uses}\n</g>\n</mask>'
+        )
+    return len(offsets)
+
+
+def simplify_loop(points, tolerance):
+    return simplify_closed_loop(merge_collinear(points), tolerance)
+
+
+def write_object_shapes(svg, shapes, projection, matrix_world, simplify_tolerance=None, cut=None, mask_id=None):
+    fill_style = FILL_STYLE
+    if mask_id is not None and cut is None:
+        fill_style = f'{FILL_STYLE} mask="url(#{mask_id})"'
+    projected_coords = {}
+    outline_loops = []
+    before = after = 0
+    for kind, coords, data in shapes:
+        if kind == 'INSTANCES':
+            write_instances(svg, coords, data, projection, matrix_world, cut, mask_id)
+        elif kind == 'LOOPS':
+            # Các island của cùng mesh dùng chung mảng toạ độ: chỉ chiếu một lần
+            key = id(coords)
+            if key not in projected_coords:
+                projected_coords[key] = project_coords(coords, projection, matrix_world)
+            projected = projected_coords[key]
+            loops = [projected[loop] for loop in data]
+            for points in loops:
+                svg.update_bounds(points)
+            before += sum(len(points) for points in loops)
+            if simplify_tolerance is not None:
+                loops = [simplify_loop(points, simplify_tolerance) for points in loops]
+            after += sum(len(points) for points in loops)
+            outline_loops.extend(loops)
+        elif kind == 'BEZIER':
+            points, left, right = (project_coords(array, projection, matrix_world) for array in coords)
+            # Bezier nằm trong bao lồi của điểm và handle
+            svg.update_bounds(np.concatenate((points, left, right)))
+            if cut is not None:
+                if data:
+                    # Vòng Bezier được chia thành đường gấp khúc để dời kerf cùng các vòng khác
+                    outline_loops.append(flatten_bezier(points, left, right, closed=True, tolerance=cut.tolerance))
+                    continue
+                attr = CUT_STYLE
+            else:
+                attr = fill_style if data else LINE_STYLE
+            svg.write(f'<path d="{format_bezier(points, left, right, closed=data)}" {attr}/>')
+        else:
+            points = project_coords(coords, projection, matrix_world)
+            svg.update_bounds(points)
+            if cut is not None:
+                if data and len(points) >= 3:
+                    outline_loops.append(points)
+                    continue
+                attr = CUT_STYLE
+            else:
+                attr = fill_style if data else LINE_STYLE
+            tag = "polygon" if data else "polyline"
+            svg.write(f'<{tag} points="{format_points(points)}" {attr}/>')
+
+    # Mỗi biên ngoài cùng các lỗ trực tiếp của nó thành một path evenodd
+    for group in outline_groups(outline_loops, cut):
+        if cut is not None:
+            for points in group:
+                svg.update_bounds(points)
+            svg.write(f'<path d="{group_path_data(group)}" {CUT_STYLE}/>')
+        else:
+            svg.write(f'<path d="{group_path_data(group)}" {fill_style} fill-rule="evenodd"/>')
+    return before, after
+
 
 class EXPORT_OT_svg_from_selection(bpy.types.Operator, ExportHelper):
     bl_idname = "export_object.svg_selection"
@@ -27,6 +249,57 @@ class EXPORT_OT_svg_from_selection(bpy.types.Operator, ExportHelper):
         description="Automatically name the SVG file as BlendFile_ObjectName",
         default=True,
     )
+    views: EnumProperty(
+        name="Views",
+        description="Views to export; several views share one evaluation of each object",
+        items=VIEW_ITEMS,
+        options={'ENUM_FLAG'},
+        default={'CURRENT'},
+    )
+    curve_tolerance: FloatProperty(
+        name="Curve Tolerance",
+        description="Maximum chord error (mm) when sampling NURBS splines; Bezier splines are exported exactly",
+        default=0.01,
+        min=0.0001,
+    )
+    simplify: BoolProperty(
+        name="Simplify Outlines",
+        description="Merge collinear vertices and simplify mesh outlines (Ramer-Douglas-Peucker)",
+        default=False,
+    )
+    simplify_tolerance: FloatProperty(
+        name="Tolerance",
+        description="Maximum deviation (mm) of simplified outlines",
+        default=0.01,
+        min=0.0,
+    )
+    cut_lines: BoolProperty(
+        name="Cut Lines",
+        description="Write stroke-only cut paths offset by half the kerf: outer boundaries outward, holes inward",
+        default=False,
+    )
+    kerf: FloatProperty(
+        name="Kerf",
+        description="Width (mm) of material removed by the cutter; paths are offset by half of it",
+        default=0.2,
+        min=0.0,
+    )
+    join_style: EnumProperty(
+        name="Corners",
+        items=[
+            ('MITER', "Miter", "Keep sharp corners (beveled past 2x the offset)"),
+            ('ROUND', "Round", "Round outside corners, sampled within the curve tolerance"),
+        ],
+        default='MITER',
+    )
+    multi_view_output: EnumProperty(
+        name="Multi-view Output",
+        items=[
+            ('FILES', "Separate Files", "One SVG per view, named File_top.svg, File_front.svg, ..."),
+            ('LAYERS', "Layers", "One SVG with a group per view, laid out side by side"),
+        ],
+        default='FILES',
+    )
 
     def invoke(self, context, event):
         if self.auto_name and context.selected_objects:
@@ -47,39 +320,45 @@ class EXPORT_OT_svg_from_selection(bpy.types.Operator, ExportHelper):
         if not rv3d or rv3d.view_perspective != 'ORTHO':
             self.report({'ERROR'}, "Only Orthographic views are supported")
             return None
-
-        forward = rv3d.view_rotation @ Vector((0, 0, -1))
-        abs_f = [abs(x) for x in forward]
-        max_axis = max(abs_f)
-        axis_index = abs_f.index(max_axis)
-
-        if axis_index == 2:  # Z-axis
-            if forward.z < 0:
-                return lambda co: (co.x, -co.y)  # Top view
-            else:
-                return lambda co: (co.x, co.y)  # Bottom view
-        elif axis_index == 1:  # Y-axis
-            if forward.y < 0:
-                return lambda co: (-co.x, -co.z)  # Back view
+        # Mọi góc nhìn trực giao: một ma trận chiếu 2x4 dựng từ view_matrix
+        return view_projection(rv3d.view_matrix)
+
+    def get_projections(self, context):
+        projections = []
+        for name, _, _ in VIEW_ITEMS:
+            if name not in self.views:
+                continue
+            if name == 'CURRENT':
+                projection = self.get_view_projection(context)
+                if projection is None:
+                    return None
             else:
-                return lambda co: (co.x, -co.z)  # Front view
-        elif axis_index == 0:  # X-axis
-            if forward.x < 0:
-                return lambda co: (co.y, -co.z)  # Right view
-            else:
-                return lambda co: (-co.y, -co.z)  # Left view
-        else:
-            self.report({'WARNING'}, "View not clearly recognized, defaulting to XY")
-            return lambda co: (co.x, co.y)  # Default to Top view
+                projection = axis_view_projection(name)
+            projections.append((name.lower(), projection))
+        return projections
 
     def execute(self, context):
-        objects = [obj for obj in context.selected_objects if obj.type in {'MESH', 'CURVE'}]
+        # Mesh con của object nhân instance không tự hiển thị: chỉ xuất qua các <use> của cha
+        objects = [
+            obj for obj in context.selected_objects
+            if obj.type in {'MESH', 'CURVE'} and not (obj.parent and is_vertex_instancer(obj.parent))
+        ]
+        # Lưới lỗ ghi sau tấm của nó: mask khoét lỗ cần bounds của tấm
+        objects.sort(key=is_vertex_instancer)
+        selected_names = {obj.name for obj in objects}
+        mask_names = {}
+        for index, obj in enumerate(objects):
+            panel_name = obj.get("grill_panel")
+            if is_vertex_instancer(obj) and panel_name in selected_names:
+                mask_names[obj.name] = mask_names[panel_name] = f"grill_mask{index}"
         if not objects:
             self.report({'ERROR'}, "No mesh or curve objects selected")
             return {'CANCELLED'}
 
-        project = self.get_view_projection(context)
-        if not project:
+        projections = self.get_projections(context)
+        if not projections:
+            if projections is not None:
+                self.report({'ERROR'}, "No view selected")
             return {'CANCELLED'}
 
         # Apply auto_name logic again if blend file is saved
@@ -89,147 +368,86 @@ class EXPORT_OT_svg_from_selection(bpy.types.Operator, ExportHelper):
             auto_filename = f"{blend_name}_{first_obj_name}{self.filename_ext}"
             self.filepath = os.path.join(os.path.dirname(bpy.data.filepath), auto_filename)
 
-        svg_lines = []
-        min_x = min_y = float('inf')
-        max_x = max_y = float('-inf')
-
-        def update_bounds(p):
-            nonlocal min_x, max_x, min_y, max_y
-            x, y = p
-            min_x = min(min_x, x)
-            max_x = max(max_x, x)
-            min_y = min(min_y, y)
-            max_y = max(max_y, y)
+        base, ext = os.path.splitext(self.filepath)
+        layered = self.multi_view_output == 'LAYERS' and len(projections) > 1
+        if len(projections) == 1:
+            paths = [self.filepath]
+        elif layered:
+            paths = [f"{base}.{label}.part" for label, _ in projections]
+        else:
+            paths = [f"{base}_{label}{ext}" for label, _ in projections]
 
         depsgraph = context.evaluated_depsgraph_get()
 
-        for obj in objects:
-            svg_lines.append(f'<!-- Object: {obj.name} -->')
-            mat_world = obj.matrix_world
-
-            if obj.type == 'MESH':
-                eval_obj = obj.evaluated_get(depsgraph)
-                mesh = eval_obj.to_mesh()
-                bm = bmesh.new()
-                bm.from_mesh(mesh)
-                bmesh.ops.triangulate(bm, faces=bm.faces)
-
-                # Group faces into connected islands
-                islands = []
-                visited = set()
-
-                def walk_faces(start_face, collected):
-                    stack = [start_face]
-                    while stack:
-                        face = stack.pop()
-                        if face.index in visited:
-                            continue
-                        visited.add(face.index)
-                        collected.append(face)
-                        for edge in face.edges:
-                            for linked_face in edge.link_faces:
-                                if linked_face.index not in visited:
-                                    stack.append(linked_face)
-
-                for face in bm.faces:
-                    if face.index not in visited:
-                        group = []
-                        walk_faces(face, group)
-                        islands.append(group)
-
-                for island in islands:
-                    boundary_edges = set()
-                    for face in island:
-                        for edge in face.edges:
-                            linked_faces = [f for f in edge.link_faces if f in island]
-                            if len(linked_faces) == 1:
-                                boundary_edges.add(edge)
-
-                    loops = []
-                    while boundary_edges:
-                        edge = boundary_edges.pop()
-                        loop = [edge.verts[0], edge.verts[1]]
-                        changed = True
-                        while changed:
-                            changed = False
-                            for e in list(boundary_edges):
-                                if loop[-1] in e.verts:
-                                    v = e.other_vert(loop[-1])
-                                    if v != loop[0]:  # Avoid closing loop early
-                                        loop.append(v)
-                                        boundary_edges.remove(e)
-                                        changed = True
-                                        break
-                        if loop[0] != loop[-1]:
-                            loop.append(loop[0])  # Close the loop
-                        loops.append(loop)
-
-                    if loops:
-                        path_data = ""
-                        for loop in loops:
-                            first = True
-                            for v in loop:
-                                co = mat_world @ v.co
-                                p = project(co)
-                                update_bounds(p)
-                                if first:
-                                    path_data += f'M {p[0]:.4f},{p[1]:.4f} '
-                                    first = False
-                                else:
-                                    path_data += f'L {p[0]:.4f},{p[1]:.4f} '
-                            path_data += 'Z '
-                        svg_lines.append(
-                            f'<path d="{path_data.strip()}" fill="#b3b3b3" stroke="none" fill-rule="evenodd"/>'
-                        )
-
-                bm.free()
-                eval_obj.to_mesh_clear()
-
-            elif obj.type == 'CURVE':
-                for spline in obj.data.splines:
-                    points = []
-                    is_closed = spline.use_cyclic_u
-                    if spline.type == 'BEZIER':
-                        for bp in spline.bezier_points:
-                            co = mat_world @ bp.co
-                            p = project(co)
-                            points.append(f"{p[0]:.4f},{p[1]:.4f}")
-                            update_bounds(p)
-                    else:
-                        for bp in spline.points:
-                            co = mat_world @ bp.co
-                            p = project(co)
-                            points.append(f"{p[0]:.4f},{p[1]:.4f}")
-                            update_bounds(p)
-                    if points:
-                        tag = "polygon" if is_closed else "polyline"
-                        attr = 'fill="#b3b3b3" stroke="none"' if is_closed else 'fill="none" stroke="#b3b3b3" stroke-width="0.2mm" vector-effect="non-scaling-stroke"'
-                        svg_lines.append(
-                            f'<{tag} points="{" ".join(points)}" {attr}/>'
-                        )
-
-        if not svg_lines:
-            self.report({'ERROR'}, "No valid geometry in selection")
+        # Mỗi object chỉ được evaluate, tam giác hoá và tìm biên một lần rồi chiếu cho mọi view;
+        # phần tử được ghi xuống file ngay, viewBox được điền lúc đóng file
+        simplify_tolerance = self.simplify_tolerance if self.simplify else None
+        cut = CutLines(self.kerf, self.join_style, self.curve_tolerance) if self.cut_lines else None
+        vertices_before = vertices_after = 0
+        part_paths = paths if layered else []
+        try:
+            with ExitStack() as stack:
+                writers = [
+                    stack.enter_context(SvgStreamWriter(path, fragment=layered, id_prefix=f"{label}_" if layered else ""))
+                    for path, (label, _) in zip(paths, projections)
+                ]
+                for obj in objects:
+                    shapes = collect_object_shapes(obj, depsgraph, self.curve_tolerance)
+                    for svg, (_, projection) in zip(writers, projections):
+                        svg.comment(f"Object: {obj.name}")
+                        mask_id = f"{svg.id_prefix}{mask_names[obj.name]}" if obj.name in mask_names else None
+                        before, after = write_object_shapes(
+                            svg, shapes, projection, obj.matrix_world, simplify_tolerance, cut, mask_id)
+                        vertices_before += before
+                        vertices_after += after
+
+            element_count = sum(svg.element_count for svg in writers)
+            if layered:
+                # Không ghép khi mọi layer rỗng: file cũ ở filepath được giữ nguyên
+                if element_count:
+                    element_count = merge_svg_layers(self.filepath, [(label, svg) for (label, _), svg in zip(projections, writers)])
+                paths = [self.filepath]
+            else:
+                # View không có phần tử nào thì writer không tạo file
+                paths = [svg.filepath for svg in writers if svg.element_count]
+        except SvgWriteError as exc:
+            # Writer đã xoá file tạm của nó; không để lại file SVG dở dang
+            self.report({'ERROR'}, f"SVG export failed: {exc}")
             return {'CANCELLED'}
+        finally:
+            # File .part của chế độ layer không được sót lại dù lỗi ở bất kỳ bước nào
+            for path in part_paths:
+                if os.path.exists(path):
+                    os.remove(path)
 
-        width = max_x - min_x
-        height = max_y - min_y
-
-        content = [
-            '<?xml version="1.0" encoding="UTF-8"?>',
-            f'<svg xmlns="http://www.w3.org/2000/svg" version="1.1" width="{width:.4f}mm" height="{height:.4f}mm"',
-            f' viewBox="{min_x:.4f} {min_y:.4f} {width:.4f} {height:.4f}" xmlns:xlink="http://www.w3.org/1999/xlink">'
-        ] + svg_lines + ['</svg>']
-
-        with open(self.filepath, 'w') as f:
-            f.write('\n'.join(content))
+        if not element_count:
+            self.report({'ERROR'}, "No valid geometry in selection")
+            return {'CANCELLED'}
 
-        self.report({'INFO'}, f"Exported {len(objects)} object(s) to {self.filepath}")
+        written = paths[0] if len(paths) == 1 else f"{len(paths)} files ({base}_*{ext})"
+        message = f"Exported {len(objects)} object(s) to {written}"
+        if cut is not None:
+            message += f", cut lines (kerf {cut.kerf:g} mm)"
+        if simplify_tolerance is not None:
+            message += f", outline vertices {vertices_before} -> {vertices_after}"
+        self.report({'INFO'}, message)
         return {'FINISHED'}
 
     def draw(self, context):
         layout = self.layout
         layout.prop(self, "auto_name")
+        layout.prop(self, "curve_tolerance")
+        layout.prop(self, "simplify")
+        if self.simplify:
+            layout.prop(self, "simplify_tolerance")
+        layout.prop(self, "cut_lines")
+        if self.cut_lines:
+            layout.prop(self, "kerf")
+            layout.prop(self, "join_style")
+        layout.label(text="Views:")
+        layout.prop(self, "views")
+        if len(self.views) > 1:
+            layout.prop(self, "multi_view_output")
 
 class VIEW3D_PT_svg_export(bpy.types.Panel):
     bl_label = "SVG Export"
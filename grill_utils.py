@@ -0,0 +1,130 @@
+import math
+import numpy as np
+
+
+# Các hàm ở đây chỉ dùng NumPy: bố trí tâm lỗ lưới tản nhiệt/loa trong đường bao tấm
+
+# Số phần tử (điểm x cạnh) tối đa của mảng tạm mỗi lượt khi tính khoảng cách tới cạnh
+DISTANCE_BUDGET = 1 << 20
+# Số điểm trung bình trong một ô lưới khi lọc cạnh theo vùng lân cận
+TILE_POINTS = 1024
+
+
+def grid_centers(low, high, pitch, pattern='HEX'):
+    # HEX: hàng cách nhau pitch * sqrt(3) / 2, hàng lẻ lệch nửa bước
+    low = np.asarray(low, dtype=np.float64)
+    high = np.asarray(high, dtype=np.float64)
+    row_step = pitch * math.sqrt(3.0) / 2.0 if pattern == 'HEX' else pitch
+    size = high - low
+    cols = int(size[0] // pitch) + 1
+    rows = int(size[1] // row_step) + 1
+
+    xs = np.arange(cols) * pitch
+    ys = np.arange(rows) * row_step
+    centers = np.empty((rows, cols, 2))
+    centers[:, :, 0] = xs[None, :]
+    centers[:, :, 1] = ys[:, None]
+    if pattern == 'HEX':
+        centers[1::2, :, 0] += pitch / 2.0
+    centers = centers.reshape(-1, 2)
+    # Căn giữa cả lưới trong bounding box
+    offset = low + (size - (centers.max(axis=0) - centers.min(axis=0))) / 2.0 - centers.min(axis=0)
+    return centers + offset
+
+
+def distance_to_loops(points, loops, max_distance=None):
+    # Với max_distance, mỗi ô lưới điểm chỉ xét các cạnh gần; kết quả > max_distance không chính xác
+    starts = np.concatenate([loop for loop in loops])
+    ends = np.concatenate([np.roll(loop, -1, axis=0) for loop in loops])
+    edge_low = np.minimum(starts, ends)
+    edge_high = np.maximum(starts, ends)
+
+    result = np.full(len(points), np.inf)
+    if max_distance is None or len(points) <= TILE_POINTS:
+        tiles = [np.arange(len(points))]
+    else:
+        low = points.min(axis=0)
+        extent = np.maximum(points.max(axis=0) - low, 1e-9)
+        tile = max(float(np.sqrt(extent[0] * extent[1] * TILE_POINTS / len(points))), float(extent.max()) / 256.0)
+        keys = np.floor((points - low) / tile).astype(np.int64)
+        order = np.lexsort((keys[:, 1], keys[:, 0]))
+        changed = np.flatnonzero(np.any(np.diff(keys[order], axis=0) != 0, axis=1)) + 1
+        tiles = np.split(order, changed)
+
+    for members in tiles:
+        tile_points = points[members]
+        if max_distance is None:
+            near = np.arange(len(starts))
+        else:
+            tile_low = tile_points.min(axis=0) - max_distance
+            tile_high = tile_points.max(axis=0) + max_distance
+            near = np.flatnonzero(np.all((edge_high >= tile_low) & (edge_low <= tile_high), axis=1))
+        if not len(near):
+            continue
+        edge_start = starts[near]
+        direction = ends[near] - edge_start
+        length_sq = np.maximum(np.einsum('ij,ij->i', direction, direction), 1e-18)
+        chunk = max(1, DISTANCE_BUDGET // len(near))
+        for first in range(0, len(members), chunk):
+            block = tile_points[first:first + chunk]
+            relative = block[:, None, :] - edge_start[None, :, :]
+            t = np.clip(np.einsum('mek,ek->me', relative, direction) / length_sq, 0.0, 1.0)
+            nearest = relative - t[:, :, None] * direction[None, :, :]
+            result[members[first:first + chunk]] = np.sqrt(np.einsum('mek,mek->me', nearest, nearest).min(axis=1))
+    return result
+
+
+def points_in_polygon_rows(points, polygon):
+    # Chẵn-lẻ, giao điểm tính một lần cho mỗi hàng y
+    ys, row = np.unique(points[:, 1], return_inverse=True)
+    row = row.ravel()
+    order = np.argsort(row, kind='stable')
+    members = np.split(order, np.flatnonzero(np.diff(row[order])) + 1)
+
+    x0, y0 = polygon[:, 0], polygon[:, 1]
+    x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+    inside = np.zeros(len(points), dtype=bool)
+    chunk = max(1, DISTANCE_BUDGET // len(polygon))
+    for first in range(0, len(ys), chunk):
+        y = ys[first:first + chunk, None]
+        crosses = (y0 > y) != (y1 > y)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_at = np.where(crosses, x0 + (y - y0) * (x1 - x0) / (y1 - y0), np.inf)
+        x_at.sort(axis=1)
+        crossing_count = np.count_nonzero(crosses, axis=1)
+        for offset, index in enumerate(members[first:first + chunk]):
+            # Số giao điểm nằm bên phải điểm (px < x_at)
+            right = crossing_count[offset] - np.searchsorted(x_at[offset], points[index, 0], side='right')
+            inside[index] = right % 2 == 1
+    return inside
+
+
+def grill_centers(outer, holes=(), pitch=6.0, hole_radius=2.0, margin=5.0, pattern='HEX'):
+    outer = np.asarray(outer, dtype=np.float64)
+    holes = [np.asarray(hole, dtype=np.float64) for hole in holes]
+    clearance = hole_radius + margin
+    low = outer.min(axis=0) + clearance
+    high = outer.max(axis=0) - clearance
+    if pitch <= 0 or np.any(high < low):
+        return np.zeros((0, 2))
+
+    centers = grid_centers(low, high, pitch, pattern)
+    keep = points_in_polygon_rows(centers, outer)
+    for hole in holes:
+        keep[keep] = ~points_in_polygon_rows(centers[keep], hole)
+    centers = centers[keep]
+    if len(centers):
+        centers = centers[distance_to_loops(centers, [outer] + holes, max_distance=clearance) >= clearance]
+    return centers
+
+
+def hole_outline(shape, size, segments=32):
+    # HEX: size là khoảng cách hai cạnh đối
+    if shape == 'SQUARE':
+        count, radius, phase = 4, size / math.sqrt(2.0), math.pi / 4.0
+    elif shape == 'HEX':
+        count, radius, phase = 6, size / math.sqrt(3.0), math.pi / 6.0
+    else:
+        count, radius, phase = max(3, segments), size / 2.0, 0.0
+    angles = phase + np.arange(count) * (2.0 * math.pi / count)
+    return np.column_stack((np.cos(angles), np.sin(angles))) * radius
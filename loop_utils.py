@@ -0,0 +1,366 @@
+import time
+import numpy as np
+
+# Các hàm ở đây chỉ dùng NumPy, nhận mảng tam giác (T, 3) và trả về chỉ số đỉnh
+
+
+def connected_components(count, pairs_a, pairs_b):
+    # Union-find vector hoá: móc gốc bằng np.minimum.at rồi nhảy con trỏ tới khi ổn định
+    labels = np.arange(count)
+    while len(pairs_a):
+        root_a = labels[pairs_a]
+        root_b = labels[pairs_b]
+        differ = root_a != root_b
+        if not differ.any():
+            break
+        low = np.minimum(root_a[differ], root_b[differ])
+        np.minimum.at(labels, root_a[differ], low)
+        np.minimum.at(labels, root_b[differ], low)
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+    return labels
+
+
+def _triangle_edges(tris):
+    edges = np.concatenate((tris[:, [0, 1]], tris[:, [1, 2]], tris[:, [2, 0]]))
+    edges.sort(axis=1)
+    owner = np.tile(np.arange(len(tris)), 3)
+    return edges, owner
+
+
+def triangle_islands(tris):
+    if not len(tris):
+        return np.zeros(0, dtype=np.int64)
+    edges, owner = _triangle_edges(tris)
+    order = np.lexsort((edges[:, 1], edges[:, 0]))
+    edges = edges[order]
+    owner = owner[order]
+    same = np.all(edges[1:] == edges[:-1], axis=1)
+    return connected_components(len(tris), owner[:-1][same], owner[1:][same])
+
+
+def island_boundary_edges(tris, islands):
+    # dict nhãn island -> cạnh biên (E, 2)
+    if not len(tris):
+        return {}
+    edges, owner = _triangle_edges(tris)
+    # Mã hoá mỗi cạnh thành một số nguyên để np.unique chạy trên mảng 1 chiều
+    keys = edges[:, 0].astype(np.int64) * (int(tris.max()) + 1) + edges[:, 1]
+    _, first, counts = np.unique(keys, return_index=True, return_counts=True)
+    single = first[counts == 1]
+    if not len(single):
+        return {}
+    labels = islands[owner[single]]
+    order = np.argsort(labels, kind='stable')
+    labels = labels[order]
+    boundary = edges[single[order]]
+    splits = np.flatnonzero(np.diff(labels)) + 1
+    starts = np.concatenate(([0], splits))
+    return {int(labels[start]): group for start, group in zip(starts, np.split(boundary, splits))}
+
+
+def chain_loops(edges):
+    # Bảng kề đỉnh -> cạnh chưa dùng, mỗi cạnh duyệt một lần
+    adjacency = {}
+    edge_list = edges.tolist() if isinstance(edges, np.ndarray) else list(edges)
+    for index, (a, b) in enumerate(edge_list):
+        adjacency.setdefault(a, []).append(index)
+        adjacency.setdefault(b, []).append(index)
+
+    used = [False] * len(edge_list)
+    loops = []
+    for start_edge, (a, b) in enumerate(edge_list):
+        if used[start_edge]:
+            continue
+        used[start_edge] = True
+        loop = [a, b]
+        current = b
+        while current != a:
+            candidates = adjacency[current]
+            # Bỏ các cạnh đã dùng ở cuối danh sách để mỗi cạnh chỉ bị xét O(1) lần
+            while candidates and used[candidates[-1]]:
+                candidates.pop()
+            if not candidates:
+                break
+            edge = candidates.pop()
+            used[edge] = True
+            u, v = edge_list[edge]
+            current = v if u == current else u
+            if current != a:
+                loop.append(current)
+        if len(loop) >= 3:
+            loops.append(loop)
+    return loops
+
+
+def merge_collinear(points, epsilon=1e-6):
+    if len(points) < 4:
+        return points
+    # Đỉnh trùng với đỉnh kế tiếp
+    step = np.roll(points, -1, axis=0) - points
+    points = points[np.abs(step).max(axis=1) > epsilon]
+    if len(points) < 4:
+        return points
+    previous = np.roll(points, 1, axis=0)
+    following = np.roll(points, -1, axis=0)
+    chord = following - previous
+    offset = points - previous
+    cross = chord[:, 0] * offset[:, 1] - chord[:, 1] * offset[:, 0]
+    length = np.hypot(chord[:, 0], chord[:, 1])
+    keep = np.abs(cross) > epsilon * np.maximum(length, epsilon)
+    if keep.sum() < 3:
+        return points
+    return points[keep]
+
+
+def simplify_closed_loop(points, tolerance):
+    # Ramer–Douglas–Peucker, tách mọi đoạn còn vượt dung sai cùng lúc
+    count = len(points)
+    if count < 4 or tolerance <= 0:
+        return points
+    # Neo tại đỉnh 0 và đỉnh xa nó nhất, vòng được mở thành đường có điểm cuối trùng điểm đầu
+    far = int(np.argmax(np.linalg.norm(points - points[0], axis=1)))
+    path = np.concatenate((points, points[:1]))
+    keep = np.zeros(count + 1, dtype=bool)
+    keep[[0, far, count]] = True
+
+    while True:
+        kept = np.flatnonzero(keep)
+        # Đoạn (kept[k], kept[k + 1]) chứa mọi đỉnh nằm giữa hai đỉnh được giữ liên tiếp
+        segment = np.searchsorted(kept, np.arange(count + 1), side='right') - 1
+        segment = np.minimum(segment, len(kept) - 2)
+        start = path[kept[segment]]
+        end = path[kept[segment + 1]]
+        chord = end - start
+        offset = path - start
+        length = np.hypot(chord[:, 0], chord[:, 1])
+        cross = np.abs(chord[:, 0] * offset[:, 1] - chord[:, 1] * offset[:, 0])
+        distance = np.where(length > 0, cross / np.where(length > 0, length, 1.0), np.hypot(offset[:, 0], offset[:, 1]))
+        distance[keep] = 0.0
+
+        # Đỉnh xa nhất của từng đoạn: sắp theo (đoạn, khoảng cách) rồi lấy phần tử cuối mỗi nhóm
+        order = np.lexsort((distance, segment))
+        last = np.flatnonzero(np.diff(segment[order], append=-1) != 0)
+        candidates = order[last]
+        candidates = candidates[distance[candidates] > tolerance]
+        if not len(candidates):
+            break
+        keep[candidates] = True
+
+    return path[:count][keep[:count]]
+
+
+def points_in_polygon(points, polygon):
+    x0, y0 = polygon[:, 0], polygon[:, 1]
+    x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+    px = points[:, 0:1]
+    py = points[:, 1:2]
+    crosses = (y0 > py) != (y1 > py)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_at = x0 + (py - y0) * (x1 - x0) / (y1 - y0)
+    return np.count_nonzero(crosses & (px < x_at), axis=1) % 2 == 1
+
+
+def nest_loops(loops):
+    # Vòng có độ sâu chẵn là biên ngoài, lẻ là lỗ của vòng chứa trực tiếp
+    count = len(loops)
+    if count <= 1:
+        return [(index, []) for index in range(count)]
+
+    lows = np.array([loop.min(axis=0) for loop in loops])
+    highs = np.array([loop.max(axis=0) for loop in loops])
+    areas = np.array([abs(signed_area(loop)) for loop in loops])
+    probes = np.array([loop[0] for loop in loops])
+
+    # Lưới đều: cạnh ô cỡ kích thước trung bình của một vòng
+    origin = lows.min(axis=0)
+    extent = np.maximum(highs.max(axis=0) - origin, 1e-9)
+    cell = max(float(np.sqrt(extent[0] * extent[1] / count)), float(extent.max()) / 1024.0, 1e-9)
+    grid = {}
+    cell_low = np.floor((lows - origin) / cell).astype(np.int64)
+    cell_high = np.floor((highs - origin) / cell).astype(np.int64)
+    for index in range(count):
+        for cx in range(cell_low[index, 0], cell_high[index, 0] + 1):
+            for cy in range(cell_low[index, 1], cell_high[index, 1] + 1):
+                grid.setdefault((cx, cy), []).append(index)
+
+    # Ứng viên chứa: cùng ô với điểm dò, bounding box bao trọn và diện tích lớn hơn
+    probe_cells = np.floor((probes - origin) / cell).astype(np.int64)
+    queries = {}
+    for inner in range(count):
+        for outer in grid.get((probe_cells[inner, 0], probe_cells[inner, 1]), ()):
+            if outer == inner or areas[outer] <= areas[inner]:
+                continue
+            if np.all(lows[outer] <= lows[inner]) and np.all(highs[outer] >= highs[inner]):
+                queries.setdefault(outer, []).append(inner)
+
+    depth = np.zeros(count, dtype=np.int64)
+    parent = np.full(count, -1, dtype=np.int64)
+    for outer, inners in queries.items():
+        inners = np.array(inners)
+        inside = inners[points_in_polygon(probes[inners], loops[outer])]
+        depth[inside] += 1
+        # Cha trực tiếp là vòng chứa có diện tích nhỏ nhất
+        closer = (parent[inside] < 0) | (areas[outer] < areas[np.maximum(parent[inside], 0)])
+        parent[inside[closer]] = outer
+
+    groups = {index: [] for index in np.flatnonzero(depth % 2 == 0).tolist()}
+    for index in np.flatnonzero(depth % 2 == 1).tolist():
+        if parent[index] in groups:
+            groups[parent[index]].append(index)
+    return list(groups.items())
+
+
+def offset_loops(loops, distances, join='MITER', miter_limit=2.0, arc_tolerance=0.01):
+    # Dương nới ra, âm thu vào, không phụ thuộc chiều vòng
+    if not len(loops):
+        return []
+    points = np.concatenate(loops).astype(np.float64)
+    counts = np.array([len(loop) for loop in loops])
+    loop_id = np.repeat(np.arange(len(loops)), counts)
+
+    # Bỏ đỉnh trùng đỉnh kế tiếp (cạnh độ dài 0 không có pháp tuyến)
+    following = _next_in_loop(counts)
+    keep = np.abs(points[following] - points).max(axis=1) > 1e-9
+    keep |= np.bincount(loop_id, weights=keep, minlength=len(loops))[loop_id] < 3
+    points, loop_id = points[keep], loop_id[keep]
+    counts = np.bincount(loop_id, minlength=len(loops))
+    following = _next_in_loop(counts)
+    previous = np.empty_like(following)
+    previous[following] = np.arange(len(following))
+
+    # Chiều của từng vòng theo dấu diện tích, pháp tuyến cạnh (đỉnh i -> đỉnh kế) quay ra ngoài
+    edge = points[following] - points
+    twice_area = np.bincount(loop_id, weights=points[:, 0] * points[following, 1] - points[following, 0] * points[:, 1],
+                             minlength=len(loops))
+    orientation = np.where(twice_area >= 0, 1.0, -1.0)[loop_id]
+    length = np.maximum(np.hypot(edge[:, 0], edge[:, 1]), 1e-12)
+    normal_out = np.column_stack((edge[:, 1], -edge[:, 0])) * (orientation / length)[:, None]
+    normal_in = normal_out[previous]
+
+    distance = np.asarray(distances, dtype=np.float64)[loop_id]
+    cosine = np.clip(np.einsum('ij,ij->i', normal_in, normal_out), -1.0, 1.0)
+    turn = normal_in[:, 0] * normal_out[:, 1] - normal_in[:, 1] * normal_out[:, 0]
+    # Góc cần nối: phía dời nằm ngoài chỗ rẽ (hai pháp tuyến toả ra)
+    needs_join = (turn * orientation * distance > 1e-12) & (np.abs(distance) > 0)
+    miter = (normal_in + normal_out) / np.maximum(1.0 + cosine, 1e-6)[:, None]
+
+    angle = np.arccos(cosine)
+    if join == 'ROUND':
+        tolerance = np.clip(arc_tolerance / np.maximum(np.abs(distance), 1e-12), 1e-9, 1.0)
+        step = 2.0 * np.arccos(1.0 - tolerance)
+        segments = np.maximum(1, np.ceil(angle / step)).astype(np.int64)
+        # Góc rẽ nhỏ (vòng đã lấy mẫu từ đường cong): đỉnh miter đã nằm trong dung sai
+        miter_error = np.abs(distance) * (np.sqrt(2.0 / np.maximum(1.0 + cosine, 1e-12)) - 1.0)
+        extra = np.where(needs_join & (miter_error > arc_tolerance), segments, 0)
+    else:
+        too_long = np.sqrt(2.0 / np.maximum(1.0 + cosine, 1e-12)) > miter_limit
+        extra = np.where(needs_join & too_long, 1, 0)
+
+    # Mỗi đỉnh sinh 1 điểm (miter) hoặc extra + 1 điểm trên cung từ normal_in tới normal_out
+    repeat = extra + 1
+    source = np.repeat(np.arange(len(points)), repeat)
+    index = np.arange(len(source)) - np.repeat(np.cumsum(repeat) - repeat, repeat)
+    fraction = index / np.maximum(extra[source], 1)
+    rotation = np.sign(turn[source]) * angle[source] * fraction
+    c, s = np.cos(rotation), np.sin(rotation)
+    n = normal_in[source]
+    direction = np.where(
+        (extra[source] > 0)[:, None],
+        np.column_stack((n[:, 0] * c - n[:, 1] * s, n[:, 0] * s + n[:, 1] * c)),
+        miter[source],
+    )
+    result = points[source] + distance[source][:, None] * direction
+    splits = np.cumsum(np.bincount(loop_id[source], minlength=len(loops)))[:-1]
+    return np.split(result, splits)
+
+
+def _next_in_loop(counts):
+    # Chỉ số đỉnh kế tiếp trong mảng ghép các vòng, đỉnh cuối quay về đỉnh đầu của vòng
+    following = np.arange(1, int(counts.sum()) + 1)
+    ends = np.cumsum(counts)
+    following[ends[counts > 0] - 1] = (ends - counts)[counts > 0]
+    return following
+
+
+def signed_area(points):
+    x = points[:, 0]
+    y = points[:, 1]
+    return float(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))) / 2.0
+
+
+def _chain_loops_legacy(edges):
+    # Cách nối vòng cũ (quét lại toàn bộ danh sách cạnh sau mỗi đỉnh), chỉ giữ cho benchmark
+    boundary_edges = {tuple(edge) for edge in edges.tolist()}
+    loops = []
+    while boundary_edges:
+        edge = boundary_edges.pop()
+        loop = [edge[0], edge[1]]
+        changed = True
+        while changed:
+            changed = False
+            for e in list(boundary_edges):
+                if loop[-1] in e:
+                    v = e[1] if e[0] == loop[-1] else e[0]
+                    if v != loop[0]:
+                        loop.append(v)
+                        boundary_edges.remove(e)
+                        changed = True
+                        break
+        loops.append(loop)
+    return loops
+
+
+def perforated_panel_fixture(rows=40, cols=40, cell=5.0):
+    # Tấm lưới đục lỗ vuông để đo hiệu năng
+    nx, ny = 2 * cols + 1, 2 * rows + 1
+    gx, gy = np.meshgrid(np.arange(nx + 1), np.arange(ny + 1))
+    coords = np.column_stack((gx.ravel(), gy.ravel())).astype(np.float64) * cell
+    cx, cy = np.meshgrid(np.arange(nx), np.arange(ny))
+    solid = ~((cx % 2 == 1) & (cy % 2 == 1))
+    cx, cy = cx[solid], cy[solid]
+    v00 = cy * (nx + 1) + cx
+    v10 = v00 + 1
+    v01 = v00 + nx + 1
+    v11 = v01 + 1
+    tris = np.concatenate((np.column_stack((v00, v10, v11)), np.column_stack((v00, v11, v01))))
+    return coords, tris.astype(np.int64)
+
+
+def benchmark_loop_chaining(rows=40, cols=40, repeat=3):
+    _, tris = perforated_panel_fixture(rows, cols)
+
+    def best_of(func):
+        best = float('inf')
+        result = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            best = min(best, time.perf_counter() - start)
+        return best, result
+
+    def new_pipeline():
+        boundaries = island_boundary_edges(tris, triangle_islands(tris))
+        return [loop for edges in boundaries.values() for loop in chain_loops(edges)]
+
+    def legacy_pipeline():
+        boundaries = island_boundary_edges(tris, triangle_islands(tris))
+        return [loop for edges in boundaries.values() for loop in _chain_loops_legacy(edges)]
+
+    new_time, new_loops = best_of(new_pipeline)
+    legacy_time, legacy_loops = best_of(legacy_pipeline)
+    speedup = legacy_time / new_time if new_time > 0 else float('inf')
+    print(f"[loops] {rows * cols} lỗ, {len(tris)} tam giác, {len(new_loops)} vòng")
+    print(f"  cũ : {legacy_time * 1000:.2f} ms ({len(legacy_loops)} vòng)")
+    print(f"  mới: {new_time * 1000:.2f} ms")
+    print(f"  nhanh hơn {speedup:.1f}x")
+    return {
+        "holes": rows * cols,
+        "loops": len(new_loops),
+        "legacy_time": legacy_time,
+        "new_time": new_time,
+        "speedup": speedup,
+    }
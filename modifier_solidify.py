@@ -1,6 +1,8 @@
 import bpy
 from bpy.props import FloatProperty, BoolProperty
 
+from . import depsgraph_dispatcher
+
 # Biến toàn cục để tránh vòng lặp cập nhật
 is_updating = False
 
@@ -25,35 +27,14 @@ def update_solidify_modifier(self, context):
             solidify_mod.use_rim = settings.solidify_fill_rim
     is_updating = False
 
-# Cập nhật panel khi modifier thay đổi
-def update_ui_on_modifier_change(scene):
+# Cập nhật panel khi modifier thay đổi hoặc khi chọn đối tượng mới
+def update_ui_from_solidify_modifier(scene, events):
     global is_updating
     if is_updating:
         return
 
-    obj = bpy.context.object
-    if not obj or obj.type != 'MESH':
-        return
-
-    solidify_mod = obj.modifiers.get("Solidify")
-    settings = scene.solidify_settings
-    if solidify_mod and solidify_mod.type == 'SOLIDIFY':
-        if (abs(settings.solidify_thickness - solidify_mod.thickness) > 0.0001 or
-            abs(settings.solidify_offset - solidify_mod.offset) > 0.0001 or
-            settings.solidify_fill_rim != solidify_mod.use_rim):
-            is_updating = True
-            settings.solidify_thickness = solidify_mod.thickness
-            settings.solidify_offset = solidify_mod.offset
-            settings.solidify_fill_rim = solidify_mod.use_rim
-            is_updating = False
-
-# Cập nhật panel khi chọn đối tượng mới
-def update_ui_on_selection_change(scene):
-    global is_updating
-    if is_updating:
-        return
-
-    obj = bpy.context.object
+    # Chạy trong timer (debounce) nên lấy active object qua view_layer thay vì context.object
+    obj = bpy.context.view_layer.objects.active
     if not obj or obj.type != 'MESH':
         return
 
@@ -226,14 +207,13 @@ def register():
     for cls in classes:
         bpy.utils.register_class(cls)
     bpy.types.Scene.solidify_settings = bpy.props.PointerProperty(type=SolidifySettings)
-    bpy.app.handlers.depsgraph_update_post.append(update_ui_on_selection_change)
-    bpy.app.handlers.depsgraph_update_post.append(update_ui_on_modifier_change)
+    depsgraph_dispatcher.subscribe(
+        "solidify_ui", update_ui_from_solidify_modifier,
+        {'OBJECT', 'ACTIVE'}, debounce=0.05, collect_ids=False,
+    )
 
 def unregister():
-    if update_ui_on_selection_change in bpy.app.handlers.depsgraph_update_post:
-        bpy.app.handlers.depsgraph_update_post.remove(update_ui_on_selection_change)
-    if update_ui_on_modifier_change in bpy.app.handlers.depsgraph_update_post:
-        bpy.app.handlers.depsgraph_update_post.remove(update_ui_on_modifier_change)
+    depsgraph_dispatcher.unsubscribe("solidify_ui")
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
     del bpy.types.Scene.solidify_settings
@@ -0,0 +1,193 @@
+import math
+import multiprocessing
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Module này chỉ dùng NumPy (không import bpy) để các tiến trình con chạy được
+
+# Vị trí của một chi tiết: điểm p của đa giác gốc nằm tại R(angle) @ p + (x, y) trên tấm `sheet`
+NestPlacement = namedtuple("NestPlacement", "index sheet x y angle")
+
+# Dưới số chi tiết này thì chạy tuần tự, chi phí khởi tạo pool không đáng
+PARALLEL_MIN_PARTS = 16
+
+
+def polygon_area(points):
+    if len(points) < 3:
+        return 0.0
+    x = points[:, 0]
+    y = points[:, 1]
+    return abs(float(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))) / 2.0
+
+
+def rotate_points(points, angle):
+    c = math.cos(angle)
+    s = math.sin(angle)
+    return points @ np.array([[c, s], [-s, c]])
+
+
+def rasterize_polygon(points, cell):
+    # Trả về (mask, góc dưới trái của ô [0, 0])
+    origin = points.min(axis=0)
+    size = points.max(axis=0) - origin
+    cols = max(1, int(math.ceil(size[0] / cell)))
+    rows = max(1, int(math.ceil(size[1] / cell)))
+    mask = np.zeros((rows, cols), dtype=bool)
+
+    local = (points - origin) / cell
+    x0, y0 = local[:, 0], local[:, 1]
+    x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+    centers_y = np.arange(rows) + 0.5
+
+    # Giao điểm của mọi dòng quét với mọi cạnh (rows x E), dòng quét đi qua tâm ô
+    crosses = (y0[None, :] <= centers_y[:, None]) != (y1[None, :] <= centers_y[:, None])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = (centers_y[:, None] - y0[None, :]) / (y1 - y0)[None, :]
+    xs = x0[None, :] + t * (x1 - x0)[None, :]
+    centers_x = np.arange(cols) + 0.5
+    for row in range(rows):
+        hits = np.sort(xs[row, crosses[row]])
+        for start, end in zip(hits[0::2], hits[1::2]):
+            mask[row, (centers_x >= start) & (centers_x < end)] = True
+    return mask, origin
+
+
+def dilate(mask, radius):
+    if radius <= 0:
+        return mask
+    rows, cols = mask.shape
+    out = np.zeros((rows + 2 * radius, cols + 2 * radius), dtype=bool)
+    for dy in range(-radius, radius + 1):
+        for dx in range(-radius, radius + 1):
+            if dx * dx + dy * dy <= radius * radius:
+                out[radius + dy:radius + dy + rows, radius + dx:radius + dx + cols] |= mask
+    return out
+
+
+def find_position(occupancy, mask):
+    # Số ô chồng lấn tại mọi vị trí tính một lần bằng tương quan FFT
+    rows, cols = occupancy.shape
+    h, w = mask.shape
+    if h > rows or w > cols:
+        return None
+    if not occupancy.any():
+        return 0, 0
+
+    padded = np.zeros((rows, cols), dtype=np.float64)
+    padded[:h, :w] = mask
+    overlap = np.fft.irfft2(np.fft.rfft2(occupancy) * np.conj(np.fft.rfft2(padded)), s=(rows, cols))
+    free = overlap[:rows - h + 1, :cols - w + 1] < 0.5
+    hits = np.flatnonzero(free)
+    if not len(hits):
+        return None
+    # flatnonzero duyệt theo hàng trước: phần tử đầu tiên là hàng thấp nhất, cột trái nhất
+    row, col = divmod(int(hits[0]), free.shape[1])
+    return row, col
+
+
+def _search(task):
+    # Hàm chạy trong tiến trình con: chỉ nhận/trả mảng NumPy và số
+    key, occupancy, mask = task
+    return key, find_position(occupancy, mask)
+
+
+def make_executor(workers=None):
+    # Chỉ dùng fork trên Linux: fork Blender trên macOS sẽ crash, Windows không có fork
+    if workers is not None and workers <= 1:
+        return None
+    if not sys.platform.startswith("linux") or "fork" not in multiprocessing.get_all_start_methods():
+        return None
+    try:
+        return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork"))
+    except (OSError, ValueError):
+        return None
+
+
+def nest_polygons(polygons, sheet_width, sheet_height, spacing=0.0, cell=None, rotations=4, executor=None):
+    # Các ứng viên (tấm, góc xoay) được đánh giá song song nếu có executor
+    if cell is None:
+        cell = max(sheet_width, sheet_height) / 512.0
+    rows = max(1, int(sheet_height // cell))
+    cols = max(1, int(sheet_width // cell))
+    # Mỗi chi tiết nới nửa khoảng cách, cộng một ô bù sai số raster (bảo thủ)
+    radius = int(math.ceil(spacing / 2.0 / cell)) + 1
+    angles = [2.0 * math.pi * step / rotations for step in range(max(1, rotations))]
+
+    areas = [polygon_area(poly) for poly in polygons]
+    masks = []
+    for poly in polygons:
+        candidates = []
+        for angle in angles:
+            rotated = rotate_points(poly, angle)
+            mask, origin = rasterize_polygon(rotated, cell)
+            candidates.append((angle, dilate(mask, radius), origin - radius * cell))
+        masks.append(candidates)
+
+    order = sorted(range(len(polygons)), key=lambda k: areas[k], reverse=True)
+    sheets = []
+    placements = [None] * len(polygons)
+    oversize = []
+    sheet_used = []
+
+    if len(polygons) < PARALLEL_MIN_PARTS:
+        executor = None
+    for k in order:
+        tasks = []
+        for sheet_index, occupancy in enumerate(sheets):
+            # Bỏ qua tấm chắc chắn không còn đủ chỗ
+            if (occupancy.size - np.count_nonzero(occupancy)) * cell * cell < areas[k]:
+                continue
+            for option, (_, mask, _) in enumerate(masks[k]):
+                tasks.append(((sheet_index, option), occupancy, mask))
+        results = None
+        if executor and len(tasks) > 1:
+            try:
+                results = list(executor.map(_search, tasks))
+            except Exception as exc:
+                # Pool hỏng (pickle, tiến trình con bị kill...): chạy tuần tự phần còn lại,
+                # người tạo pool vẫn chịu trách nhiệm shutdown
+                print(f"[nesting] Tắt xử lý song song: {exc}")
+                executor = None
+        if results is None:
+            results = [_search(task) for task in tasks]
+
+        best = None
+        for (sheet_index, option), found in results:
+            if found is None:
+                continue
+            candidate = (sheet_index, found[0], found[1], option)
+            if best is None or candidate < best:
+                best = candidate
+
+        if best is None:
+            occupancy = np.zeros((rows, cols), dtype=bool)
+            sheets.append(occupancy)
+            sheet_used.append(0.0)
+            sheet_index = len(sheets) - 1
+            for option, (_, mask, _) in enumerate(masks[k]):
+                found = find_position(occupancy, mask)
+                if found is not None:
+                    best = (sheet_index, found[0], found[1], option)
+                    break
+            if best is None:
+                # Quá khổ: giữ một tấm riêng, đặt ở góc với góc xoay đầu tiên
+                angle, _, origin = masks[k][0]
+                placements[k] = NestPlacement(k, sheet_index, -origin[0], -origin[1], angle)
+                occupancy[:] = True
+                sheet_used[sheet_index] += areas[k]
+                oversize.append(k)
+                continue
+
+        sheet_index, row, col, option = best
+        angle, mask, origin = masks[k][option]
+        h, w = mask.shape
+        sheets[sheet_index][row:row + h, col:col + w] |= mask
+        sheet_used[sheet_index] += areas[k]
+        placements[k] = NestPlacement(k, sheet_index, col * cell - origin[0], row * cell - origin[1], angle)
+
+    sheet_area = sheet_width * sheet_height
+    utilisation = [used / sheet_area if sheet_area > 0 else 0.0 for used in sheet_used]
+    return placements, utilisation, oversize
@@ -0,0 +1,121 @@
+from collections import namedtuple
+
+# Vị trí của một chi tiết sau khi xếp: index theo danh sách đầu vào, số tấm, góc dưới trái, có xoay 90° không
+Placement = namedtuple("Placement", "index sheet x y rotated")
+
+
+# Đường chân trời của một tấm: các đoạn [x, y, rộng] liên tiếp từ trái sang phải
+class _Skyline:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.segments = [[0.0, 0.0, width]]
+        self.used_area = 0.0
+
+    def _fit_at(self, i, w, h):
+        x = self.segments[i][0]
+        if x + w > self.width + 1e-9:
+            return None
+        y = 0.0
+        remaining = w
+        j = i
+        while remaining > 1e-9:
+            if j >= len(self.segments):
+                return None
+            y = max(y, self.segments[j][1])
+            if y + h > self.height + 1e-9:
+                return None
+            remaining -= self.segments[j][2]
+            j += 1
+        return y
+
+    def find(self, w, h):
+        best = None
+        for i in range(len(self.segments)):
+            y = self._fit_at(i, w, h)
+            if y is None:
+                continue
+            candidate = (y, self.segments[i][0], i)
+            if best is None or candidate < best:
+                best = candidate
+        return best
+
+    def place(self, i, x, y, w, h):
+        top = y + h
+        right = x + w
+        new_segments = self.segments[:i]
+        new_segments.append([x, top, w])
+        for seg in self.segments[i:]:
+            seg_right = seg[0] + seg[2]
+            if seg_right <= right + 1e-9:
+                continue
+            if seg[0] < right:
+                seg = [right, seg[1], seg_right - right]
+            new_segments.append(seg)
+        # Gộp các đoạn liền kề cùng độ cao để skyline luôn ngắn
+        merged = [new_segments[0]]
+        for seg in new_segments[1:]:
+            if abs(seg[1] - merged[-1][1]) < 1e-9:
+                merged[-1][2] += seg[2]
+            else:
+                merged.append(seg)
+        self.segments = merged
+
+
+def pack_rectangles(sizes, sheet_width, sheet_height, spacing=0.0, allow_rotate=True):
+    # Skyline bottom-left; chi tiết lớn hơn tấm được đặt riêng một tấm
+    # Nới mỗi chi tiết và tấm thêm `spacing` để các chi tiết luôn cách nhau đúng khoảng này
+    inner_w = sheet_width + spacing
+    inner_h = sheet_height + spacing
+    order = sorted(range(len(sizes)), key=lambda k: (max(sizes[k]), min(sizes[k])), reverse=True)
+
+    sheets = []
+    placements = [None] * len(sizes)
+    oversize = []
+
+    for k in order:
+        w, h = sizes[k]
+        options = [(w + spacing, h + spacing, False)]
+        if allow_rotate and abs(w - h) > 1e-9:
+            options.append((h + spacing, w + spacing, True))
+
+        placed = False
+        for sheet_index, sheet in enumerate(sheets):
+            best = None
+            for ow, oh, rotated in options:
+                found = sheet.find(ow, oh)
+                if found and (best is None or found < best[0]):
+                    best = (found, ow, oh, rotated)
+            if best:
+                (y, x, i), ow, oh, rotated = best
+                sheet.place(i, x, y, ow, oh)
+                sheet.used_area += w * h
+                placements[k] = Placement(k, sheet_index, x, y, rotated)
+                placed = True
+                break
+        if placed:
+            continue
+
+        sheet = _Skyline(inner_w, inner_h)
+        sheets.append(sheet)
+        sheet_index = len(sheets) - 1
+        best = None
+        for ow, oh, rotated in options:
+            found = sheet.find(ow, oh)
+            if found and (best is None or found < best[0]):
+                best = (found, ow, oh, rotated)
+        if best:
+            (y, x, i), ow, oh, rotated = best
+            sheet.place(i, x, y, ow, oh)
+            placements[k] = Placement(k, sheet_index, x, y, rotated)
+        else:
+            # Quá khổ: giữ một tấm riêng, đặt ở góc
+            rotated = allow_rotate and w > sheet_width and h <= sheet_width
+            placements[k] = Placement(k, sheet_index, 0.0, 0.0, rotated)
+            sheet.segments = []
+            oversize.append(k)
+        sheet.used_area += w * h
+
+    sheet_area = sheet_width * sheet_height
+    utilisation = [sheet.used_area / sheet_area if sheet_area > 0 else 0.0 for sheet in sheets]
+    return placements, utilisation, oversize
@@ -0,0 +1,106 @@
+import bpy
+from bpy.app.handlers import persistent
+
+from . import depsgraph_dispatcher
+
+# Tên các mesh đang được chọn theo thứ tự object trong view layer (dict dùng như ordered set)
+_selected_mesh_names = {}
+_view_layer_key = None
+_needs_rebuild = True
+
+
+def _rebuild(scene, view_layer):
+    global _needs_rebuild, _view_layer_key
+    _selected_mesh_names.clear()
+    names = [obj.name for obj in view_layer.objects.selected if obj.type == 'MESH']
+    if len(names) > 1:
+        # Thứ tự base trong view layer có thể khác scene.objects (collection lồng nhau),
+        # chỉ khi chọn nhiều mesh mới cần duyệt scene để giữ đúng thứ tự cũ
+        selected = set(names)
+        names = [obj.name for obj in scene.objects if obj.name in selected]
+    for name in names:
+        _selected_mesh_names[name] = None
+    _view_layer_key = view_layer.as_pointer()
+    _needs_rebuild = False
+
+
+def _track(obj, view_layer):
+    if obj.type == 'MESH' and obj.name in view_layer.objects and obj.select_get(view_layer=view_layer):
+        if obj.name not in _selected_mesh_names:
+            # Thêm vào cuối sẽ sai thứ tự so với scene.objects nên đọc lại khi cần
+            mark_selection_dirty()
+    else:
+        _selected_mesh_names.pop(obj.name, None)
+
+
+def mark_selection_dirty():
+    global _needs_rebuild
+    _needs_rebuild = True
+
+
+def update_selection_from_events(scene, events):
+    view_layer = events.view_layer
+    if view_layer is None or view_layer.as_pointer() != _view_layer_key:
+        mark_selection_dirty()
+        return
+
+    for obj in events.object_ids:
+        _track(obj, view_layer)
+    if events.scene_updated:
+        # Thay đổi chọn (select/deselect all, click) chỉ báo trên Scene
+        mark_selection_dirty()
+
+    active = view_layer.objects.active
+    if events.active_changed and active:
+        _track(active, view_layer)
+
+
+def _resolve(name, view_layer):
+    obj = view_layer.objects.get(name)
+    if obj and obj.type == 'MESH' and obj.select_get(view_layer=view_layer):
+        return obj
+    return None
+
+
+def get_first_selected_mesh(context=None):
+    # Theo thứ tự object trong scene, như vòng quét scene.objects cũ
+    context = context or bpy.context
+    view_layer = context.view_layer
+    if _needs_rebuild or view_layer.as_pointer() != _view_layer_key:
+        _rebuild(context.scene, view_layer)
+
+    stale = False
+    while _selected_mesh_names:
+        name = next(iter(_selected_mesh_names))
+        obj = _resolve(name, view_layer)
+        if obj:
+            return obj
+        # Object đã bị đổi tên/xoá/bỏ chọn mà chưa nhận được cập nhật
+        del _selected_mesh_names[name]
+        stale = True
+
+    if stale:
+        _rebuild(context.scene, view_layer)
+        for name in _selected_mesh_names:
+            return view_layer.objects.get(name)
+    return None
+
+
+@persistent
+def selection_tracker_load_handler(*args):
+    _selected_mesh_names.clear()
+    mark_selection_dirty()
+
+
+def register():
+    mark_selection_dirty()
+    depsgraph_dispatcher.subscribe("selection_tracker", update_selection_from_events, {'OBJECT', 'SCENE', 'ACTIVE'}, priority=-20)
+    if selection_tracker_load_handler not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(selection_tracker_load_handler)
+
+
+def unregister():
+    depsgraph_dispatcher.unsubscribe("selection_tracker")
+    if selection_tracker_load_handler in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(selection_tracker_load_handler)
+    _selected_mesh_names.clear()
@@ -0,0 +1,285 @@
+import bpy
+import math
+import numpy as np
+
+from . import selection_tracker
+from .area_utils import mesh_surface_area, mesh_triangle_indices, triangle_areas
+from .loop_utils import connected_components
+
+# Kiểu attribute -> (tên thuộc tính cho foreach_get/foreach_set, số thành phần, dtype)
+ATTRIBUTE_LAYOUT = {
+    'FLOAT': ("value", 1, np.float32),
+    'INT': ("value", 1, np.int32),
+    'INT8': ("value", 1, np.int32),
+    'BOOLEAN': ("value", 1, bool),
+    'FLOAT2': ("vector", 2, np.float32),
+    'INT32_2D': ("value", 2, np.int32),
+    'FLOAT_VECTOR': ("vector", 3, np.float32),
+    'FLOAT_COLOR': ("color", 4, np.float32),
+    'BYTE_COLOR': ("color", 4, np.float32),
+    'QUATERNION': ("value", 4, np.float32),
+}
+# Attribute đã được ghi riêng (toạ độ, vật liệu, smooth)
+HANDLED_ATTRIBUTES = {"position", "material_index", "sharp_face"}
+
+
+def read_attributes(mesh):
+    # Attribute chung (vertex color, sharp_edge, crease, attribute của người dùng...),
+    # bỏ qua attribute nội bộ (tên bắt đầu bằng ".") và UV map (đã đọc riêng)
+    skip = HANDLED_ATTRIBUTES | {layer.name for layer in mesh.uv_layers}
+    attributes = []
+    for attribute in mesh.attributes:
+        layout = ATTRIBUTE_LAYOUT.get(attribute.data_type)
+        if attribute.name.startswith(".") or attribute.name in skip or layout is None:
+            continue
+        prop, width, dtype = layout
+        values = np.empty(len(attribute.data) * width, dtype=dtype)
+        attribute.data.foreach_get(prop, values)
+        attributes.append((attribute.name, attribute.domain, attribute.data_type, values.reshape(len(attribute.data), width)))
+    return attributes
+
+
+def read_deform_weights(mesh):
+    # Không có foreach cho trọng số nhóm đỉnh nên duyệt một lần: (đỉnh, nhóm, trọng số)
+    weights = [(vertex.index, item.group, item.weight) for vertex in mesh.vertices for item in vertex.groups]
+    if not weights:
+        return None
+    vertex, group, weight = zip(*weights)
+    return np.array(vertex, dtype=np.int64), np.array(group, dtype=np.int64), np.array(weight, dtype=np.float32)
+
+
+def read_face_arrays(mesh, with_weights=False):
+    polygon_count = len(mesh.polygons)
+    loop_count = len(mesh.loops)
+
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    loop_start = np.empty(polygon_count, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_start)
+    loop_total = np.empty(polygon_count, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_total)
+    material_index = np.empty(polygon_count, dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", material_index)
+    use_smooth = np.empty(polygon_count, dtype=bool)
+    mesh.polygons.foreach_get("use_smooth", use_smooth)
+    loop_vertex = np.empty(loop_count, dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vertex)
+    loop_edge = np.empty(loop_count, dtype=np.int32)
+    mesh.loops.foreach_get("edge_index", loop_edge)
+    edge_vertices = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edge_vertices)
+    use_seam = np.empty(len(mesh.edges), dtype=bool)
+    mesh.edges.foreach_get("use_seam", use_seam)
+
+    uv_layers = []
+    for layer in mesh.uv_layers:
+        uv = np.empty(loop_count * 2, dtype=np.float32)
+        layer.data.foreach_get("uv", uv)
+        uv_layers.append((layer.name, uv.reshape(-1, 2)))
+
+    return {
+        'co': co.reshape(-1, 3),
+        'loop_start': loop_start,
+        'loop_total': loop_total,
+        'material_index': material_index,
+        'use_smooth': use_smooth,
+        'loop_vertex': loop_vertex,
+        'loop_edge': loop_edge,
+        'edge_vertices': edge_vertices.reshape(-1, 2),
+        'use_seam': use_seam,
+        'uv_layers': uv_layers,
+        'attributes': read_attributes(mesh),
+        'deform_weights': read_deform_weights(mesh) if with_weights else None,
+    }
+
+
+def group_loops(arrays, faces):
+    totals = arrays['loop_total'][faces]
+    starts = arrays['loop_start'][faces]
+    return np.repeat(starts - np.concatenate(([0], np.cumsum(totals)[:-1])), totals) + np.arange(totals.sum())
+
+
+def build_face_group_mesh(name, arrays, faces, materials=()):
+    # Giữ UV, vật liệu, smooth, seam và attribute chung theo từng domain
+    faces = np.asarray(faces, dtype=np.int64)
+    totals = arrays['loop_total'][faces]
+    loops = group_loops(arrays, faces)
+    verts, loop_vertex = np.unique(arrays['loop_vertex'][loops], return_inverse=True)
+    # Tự tạo cạnh từ cạnh gốc (thay cho calc_edges) để biết cạnh mới ứng với cạnh gốc nào
+    edges, loop_edge = np.unique(arrays['loop_edge'][loops], return_inverse=True)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(verts))
+    mesh.vertices.foreach_set("co", arrays['co'][verts].ravel())
+    mesh.edges.add(len(edges))
+    mesh.edges.foreach_set("vertices", np.searchsorted(verts, arrays['edge_vertices'][edges]).astype(np.int32).ravel())
+    mesh.edges.foreach_set("use_seam", arrays['use_seam'][edges])
+    mesh.loops.add(len(loops))
+    mesh.loops.foreach_set("vertex_index", loop_vertex.astype(np.int32))
+    mesh.loops.foreach_set("edge_index", loop_edge.astype(np.int32))
+    mesh.polygons.add(len(faces))
+    # Blender 4.x suy ra loop_total từ loop_start liên tiếp
+    mesh.polygons.foreach_set("loop_start", np.concatenate(([0], np.cumsum(totals)[:-1])).astype(np.int32))
+    mesh.polygons.foreach_set("material_index", arrays['material_index'][faces])
+    mesh.polygons.foreach_set("use_smooth", arrays['use_smooth'][faces])
+    for layer_name, uv in arrays['uv_layers']:
+        mesh.uv_layers.new(name=layer_name).data.foreach_set("uv", uv[loops].ravel())
+
+    indices = {'POINT': verts, 'EDGE': edges, 'FACE': faces, 'CORNER': loops}
+    for attribute_name, domain, data_type, values in arrays['attributes']:
+        if domain not in indices:
+            continue
+        attribute = mesh.attributes.new(attribute_name, data_type, domain)
+        attribute.data.foreach_set(ATTRIBUTE_LAYOUT[data_type][0], values[indices[domain]].ravel())
+
+    for material in materials:
+        mesh.materials.append(material)
+    mesh.update()
+    return mesh
+
+
+def copy_deform_weights(new_obj, arrays, faces):
+    vertex, group, weight = arrays['deform_weights']
+    verts = np.unique(arrays['loop_vertex'][group_loops(arrays, np.asarray(faces, dtype=np.int64))])
+    position = np.minimum(np.searchsorted(verts, vertex), len(verts) - 1)
+    used = verts[position] == vertex
+    new_vertex, group, weight = position[used], group[used], weight[used]
+    # VertexGroup.add nhận một trọng số cho cả danh sách đỉnh nên gom theo (nhóm, trọng số)
+    for group_index in np.unique(group):
+        in_group = group == group_index
+        vertex_group = new_obj.vertex_groups[int(group_index)]
+        for value in np.unique(weight[in_group]):
+            vertex_group.add(new_vertex[in_group & (weight == value)].tolist(), float(value), 'REPLACE')
+
+
+def create_group_objects(obj, arrays, groups, mesh_name, materials=(), clear_modifiers=False):
+    # Mỗi nhóm mặt một bản sao của obj, chưa link vào scene
+    new_objects = []
+    for faces in groups:
+        new_obj = obj.copy()
+        new_obj.data = build_face_group_mesh(mesh_name, arrays, faces, materials)
+        if arrays['deform_weights'] is not None:
+            copy_deform_weights(new_obj, arrays, faces)
+        if clear_modifiers:
+            new_obj.modifiers.clear()
+        new_objects.append(new_obj)
+    return new_objects
+
+
+def link_group_objects(obj, new_objects, keep_source=False):
+    # Link hàng loạt sau khi đã tạo xong, không cập nhật view layer giữa chừng
+    for collection in list(obj.users_collection):
+        for new_obj in new_objects:
+            collection.objects.link(new_obj)
+
+    view_layer = bpy.context.view_layer
+    if keep_source:
+        obj.select_set(False)
+    else:
+        mesh = obj.data
+        bpy.data.objects.remove(obj)
+        if mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
+    for new_obj in new_objects:
+        if new_obj.name in view_layer.objects:
+            new_obj.select_set(True)
+    if new_objects and new_objects[0].name in view_layer.objects:
+        view_layer.objects.active = new_objects[0]
+    selection_tracker.mark_selection_dirty()
+
+
+def separate_face_groups(obj, groups):
+    # Đặt tên như bpy.ops.mesh.separate và xoá object gốc như nút "Tách Face" cũ
+    if obj.mode == 'EDIT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    mesh = obj.data
+    arrays = read_face_arrays(mesh, with_weights=bool(obj.vertex_groups))
+    new_objects = create_group_objects(obj, arrays, groups, mesh.name, list(mesh.materials))
+    link_group_objects(obj, new_objects)
+    return new_objects
+
+
+def separate_faces(obj):
+    return separate_face_groups(obj, [[index] for index in range(len(obj.data.polygons))])
+
+
+def coplanar_face_groups(mesh, arrays, angle_tolerance=math.radians(1.0), distance_tolerance=0.01):
+    # So từng cặp mặt kề nhau nên không bị tách ở biên làm tròn như khi lượng tử hoá
+    count = len(mesh.polygons)
+    if not count:
+        return []
+    normals = np.empty(count * 3, dtype=np.float32)
+    mesh.polygons.foreach_get("normal", normals)
+    centers = np.empty(count * 3, dtype=np.float32)
+    mesh.polygons.foreach_get("center", centers)
+    normals = normals.reshape(-1, 3).astype(np.float64)
+    centers = centers.reshape(-1, 3).astype(np.float64)
+
+    # Hai mặt kề nhau nếu có chung cạnh: sắp loop theo cạnh, các loop liên tiếp cùng cạnh là một cặp
+    loop_face = np.repeat(np.arange(count), arrays['loop_total'])
+    order = np.argsort(arrays['loop_edge'], kind='stable')
+    edges = arrays['loop_edge'][order]
+    faces = loop_face[order]
+    same_edge = edges[1:] == edges[:-1]
+    pairs_a = faces[:-1][same_edge]
+    pairs_b = faces[1:][same_edge]
+
+    cosine = np.einsum('ij,ij->i', normals[pairs_a], normals[pairs_b])
+    gap = centers[pairs_b] - centers[pairs_a]
+    distance = np.maximum(
+        np.abs(np.einsum('ij,ij->i', gap, normals[pairs_a])),
+        np.abs(np.einsum('ij,ij->i', gap, normals[pairs_b])),
+    )
+    # Dung sai nhỏ cho sai số float32 của pháp tuyến và tâm mặt
+    keep = (cosine >= math.cos(angle_tolerance) - 1e-6) & (distance <= distance_tolerance + 1e-6)
+
+    labels = connected_components(count, pairs_a[keep], pairs_b[keep])
+    order = np.argsort(labels, kind='stable')
+    splits = np.flatnonzero(np.diff(labels[order])) + 1
+    return np.split(order, splits)
+
+
+def group_perimeter(arrays, faces, coords):
+    loop_edge = arrays['loop_edge'][group_loops(arrays, np.asarray(faces))]
+    edges, counts = np.unique(loop_edge, return_counts=True)
+    boundary = arrays['edge_vertices'][edges[counts == 1]]
+    return float(np.linalg.norm(coords[boundary[:, 0]] - coords[boundary[:, 1]], axis=1).sum())
+
+
+def extract_coplanar_panels(obj, depsgraph, angle_tolerance=math.radians(1.0), distance_tolerance=0.01,
+                            min_area=0.0, keep_source=True):
+    # min_area cùng đơn vị world với "panel_area" hiển thị cho người dùng
+    if obj.mode == 'EDIT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    eval_obj = obj.evaluated_get(depsgraph)
+    mesh = eval_obj.to_mesh()
+    try:
+        arrays = read_face_arrays(mesh, with_weights=bool(obj.vertex_groups))
+        groups = coplanar_face_groups(mesh, arrays, angle_tolerance, distance_tolerance)
+
+        matrix = np.array(obj.matrix_world, dtype=np.float64)
+        world = arrays['co'] @ matrix[:3, :3].T + matrix[:3, 3]
+        # Diện tích world của từng mặt bằng cùng kernel tam giác với mesh_surface_area
+        tris = mesh_triangle_indices(mesh)
+        triangle_polygon = np.empty(len(tris), dtype=np.int32)
+        mesh.loop_triangles.foreach_get("polygon_index", triangle_polygon)
+        polygon_area = np.bincount(triangle_polygon, weights=triangle_areas(world, tris), minlength=len(mesh.polygons))
+        group_area = np.array([polygon_area[faces].sum() for faces in groups])
+        ordered = [groups[i] for i in np.argsort(-group_area, kind='stable') if group_area[i] >= min_area]
+        perimeters = [group_perimeter(arrays, faces, world) for faces in ordered]
+
+        new_objects = create_group_objects(
+            obj, arrays, ordered, f"{obj.name}_panel", list(mesh.materials), clear_modifiers=True)
+    finally:
+        eval_obj.to_mesh_clear()
+
+    for new_obj, perimeter in zip(new_objects, perimeters):
+        new_obj.name = f"{obj.name}_panel"
+        new_obj["panel_area"] = mesh_surface_area(new_obj.data, obj.matrix_world)
+        new_obj["panel_perimeter"] = perimeter
+
+    link_group_objects(obj, new_objects, keep_source=keep_source)
+    return new_objects
@@ -1,5 +1,7 @@
 import bpy
 
+from . import depsgraph_dispatcher
+
 class OBJECT_OT_change_units(bpy.types.Operator):
     bl_idname = "scene.change_units"
     bl_label = "Set Default Units"
@@ -28,11 +30,49 @@ class SettingsPanel(bpy.types.Panel):
         layout = self.layout
         layout.operator("scene.change_units", text="Set đơn vị để in 3D")
 
+class WM_OT_DepsgraphDispatcherStats(bpy.types.Operator):
+    bl_idname = "wm.depsgraph_dispatcher_stats"
+    bl_label = "In thống kê handler"
+    bl_description = "In số lần gọi và thời gian của từng depsgraph subscriber ra console"
+
+    reset: bpy.props.BoolProperty(name="Reset", default=False)
+
+    def execute(self, context):
+        if self.reset:
+            depsgraph_dispatcher.reset_stats()
+            self.report({'INFO'}, "Đã reset thống kê handler.")
+        else:
+            depsgraph_dispatcher.print_stats()
+            self.report({'INFO'}, "Đã in thống kê handler ra console.")
+        return {'FINISHED'}
+
+class VIEW3D_PT_DepsgraphDispatcherPanel(bpy.types.Panel):
+    bl_label = "Depsgraph handlers"
+    bl_idname = "VIEW3D_PT_depsgraph_dispatcher"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = 'Box Design'
+    bl_parent_id = "PT_SettingsPanel"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        col = layout.column(align=True)
+        for name, calls, total_ms, peak_ms in depsgraph_dispatcher.get_stats():
+            col.label(text=f"{name}: {calls} lần, {total_ms:.1f} ms (max {peak_ms:.1f})")
+        row = layout.row()
+        row.operator("wm.depsgraph_dispatcher_stats", text="In ra console").reset = False
+        row.operator("wm.depsgraph_dispatcher_stats", text="Reset").reset = True
+
 def register():
     bpy.utils.register_class(OBJECT_OT_change_units)
     bpy.utils.register_class(SettingsPanel)
+    bpy.utils.register_class(WM_OT_DepsgraphDispatcherStats)
+    bpy.utils.register_class(VIEW3D_PT_DepsgraphDispatcherPanel)
 
 def unregister():
+    bpy.utils.unregister_class(VIEW3D_PT_DepsgraphDispatcherPanel)
+    bpy.utils.unregister_class(WM_OT_DepsgraphDispatcherStats)
     bpy.utils.unregister_class(OBJECT_OT_change_units)
     bpy.utils.unregister_class(SettingsPanel)
 
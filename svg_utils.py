@@ -0,0 +1,193 @@
+import os
+import shutil
+import numpy as np
+
+# Chỗ dành sẵn cho thẻ <svg ...> mở đầu; được ghi đè khi đã biết bounds
+SVG_HEADER_RESERVE = 320
+
+SVG_OPEN_TAG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" version="1.1" width="{width:.4f}mm" height="{height:.4f}mm"'
+    ' viewBox="{min_x:.4f} {min_y:.4f} {width:.4f} {height:.4f}" xmlns:xlink="http://www.w3.org/1999/xlink"'
+)
+
+
+class SvgWriteError(Exception):
+    pass
+
+
+# Các view chuẩn: (trục world hướng sang phải, trục world hướng lên) trên màn hình
+STANDARD_VIEWS = {
+    'TOP': ((1, 0, 0), (0, 1, 0)),
+    'BOTTOM': ((1, 0, 0), (0, -1, 0)),
+    'FRONT': ((1, 0, 0), (0, 0, 1)),
+    'BACK': ((-1, 0, 0), (0, 0, 1)),
+    'RIGHT': ((0, 1, 0), (0, 0, 1)),
+    'LEFT': ((0, -1, 0), (0, 0, 1)),
+}
+
+
+def view_projection(view_matrix):
+    # Chỉ dùng phần xoay của view_matrix nên không phụ thuộc pan/zoom
+    rotation = np.array(view_matrix, dtype=np.float64)[:3, :3]
+    projection = np.zeros((2, 4))
+    projection[0, :3] = rotation[0]
+    projection[1, :3] = -rotation[1]
+    return projection
+
+
+def axis_view_projection(name):
+    right, up = STANDARD_VIEWS[name]
+    return view_projection((right, up, np.cross(right, up)))
+
+
+def project_coords(coords, projection, matrix_world=None):
+    if matrix_world is not None:
+        projection = projection @ np.array(matrix_world, dtype=np.float64)
+    return coords @ projection[:, :3].T + projection[:, 3]
+
+
+def format_points(points, precision=4):
+    if not len(points):
+        return ""
+    pattern = f"%.{precision}f,%.{precision}f"
+    return " ".join([pattern] * len(points)) % tuple(np.asarray(points, dtype=np.float64).ravel())
+
+
+def format_loop(points, precision=4, closed=True):
+    if not len(points):
+        return ""
+    pattern = f"%.{precision}f,%.{precision}f"
+    text = f"M {pattern} " + f"L {pattern} " * (len(points) - 1)
+    text = text % tuple(np.asarray(points, dtype=np.float64).ravel())
+    return text + "Z" if closed else text.rstrip()
+
+
+def format_uses(href, offsets, precision=4):
+    if not len(offsets):
+        return ""
+    pattern = f'<use xlink:href="#{href}" x="%.{precision}f" y="%.{precision}f"/>'
+    return "\n".join([pattern] * len(offsets)) % tuple(np.asarray(offsets, dtype=np.float64).ravel())
+
+
+def format_bezier(points, left, right, closed=False, precision=4):
+    # Phép chiếu trực giao là affine nên đường cong chiếu vẫn là Bezier bậc ba
+    if not len(points):
+        return ""
+    pattern = f"%.{precision}f,%.{precision}f"
+    if closed:
+        ends = np.concatenate((points[1:], points[:1]))
+        ends_left = np.concatenate((left[1:], left[:1]))
+        starts_right = right
+    else:
+        ends, ends_left, starts_right = points[1:], left[1:], right[:-1]
+    segments = np.stack((starts_right, ends_left, ends), axis=1)
+    text = f"M {pattern}" % tuple(points[0])
+    if len(segments):
+        text += " " + " ".join([f"C {pattern} {pattern} {pattern}"] * len(segments)) % tuple(
+            np.asarray(segments, dtype=np.float64).ravel())
+    return text + " Z" if closed else text
+
+
+# Thẻ <svg> được giữ chỗ và ghi đè lúc đóng; file tạm chỉ thay file cũ khi thành công
+# và đã ghi ít nhất một phần tử
+class SvgStreamWriter:
+    def __init__(self, filepath, fragment=False, id_prefix=""):
+        self.filepath = filepath
+        # fragment=True: chỉ ghi các phần tử (không có header/thẻ <svg>), dùng để ghép layer
+        self.fragment = fragment
+        # Tiền tố id giữ cho id không trùng khi nhiều fragment được ghép vào một file
+        self.id_prefix = id_prefix
+        self.element_count = 0
+        self._id_count = 0
+        self.min = np.array([np.inf, np.inf])
+        self.max = np.array([-np.inf, -np.inf])
+        self._file = None
+        self._header_offset = 0
+        self._temp_path = f"{filepath}.tmp"
+
+    def __enter__(self):
+        self._file = open(self._temp_path, 'wb')
+        if not self.fragment:
+            self._file.write(b'<?xml version="1.0" encoding="UTF-8"?>\n')
+            self._header_offset = self._file.tell()
+            self._file.write(b' ' * SVG_HEADER_RESERVE + b'>\n')
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        success = False
+        try:
+            if exc_type is None:
+                self._finish()
+                success = True
+        finally:
+            self._file.close()
+            self._file = None
+            if success and self.element_count:
+                os.replace(self._temp_path, self.filepath)
+            elif os.path.exists(self._temp_path):
+                os.remove(self._temp_path)
+        return False
+
+    def update_bounds(self, points):
+        if len(points):
+            np.minimum(self.min, points.min(axis=0), out=self.min)
+            np.maximum(self.max, points.max(axis=0), out=self.max)
+
+    def comment(self, text):
+        # "--" không hợp lệ trong comment XML
+        self._write_line(f"<!-- {text.replace('--', '- -')} -->")
+
+    def write(self, element):
+        self._write_line(element)
+        self.element_count += 1
+
+    def new_id(self, name):
+        self._id_count += 1
+        return f"{self.id_prefix}{name}{self._id_count}"
+
+    def write_fragment(self, fragment, label, dx, dy):
+        self._write_line(f'<g id="{label}" transform="translate({dx:.4f},{dy:.4f})">')
+        with open(fragment.filepath, 'rb') as source:
+            shutil.copyfileobj(source, self._file)
+        self._write_line('</g>')
+        if fragment.element_count:
+            self.update_bounds(np.array([fragment.min + (dx, dy), fragment.max + (dx, dy)]))
+        self.element_count += fragment.element_count
+
+    def _write_line(self, text):
+        self._file.write(text.encode('utf-8'))
+        self._file.write(b'\n')
+
+    def _finish(self):
+        if self.fragment:
+            return
+        self._write_line('</svg>')
+        if self.element_count:
+            min_x, min_y = self.min
+            width, height = self.max - self.min
+        else:
+            min_x = min_y = width = height = 0.0
+        header = SVG_OPEN_TAG.format(min_x=min_x, min_y=min_y, width=width, height=height).encode('utf-8')
+        if len(header) > SVG_HEADER_RESERVE:
+            raise SvgWriteError(f"Thẻ <svg> dài {len(header)} byte, vượt quá chỗ dành sẵn {SVG_HEADER_RESERVE}")
+        self._file.seek(self._header_offset)
+        self._file.write(header.ljust(SVG_HEADER_RESERVE))
+
+
+def merge_svg_layers(filepath, layers, gap=10.0):
+    # Mỗi view một nhóm <g> đặt cạnh nhau theo chiều ngang
+    cursor = 0.0
+    try:
+        with SvgStreamWriter(filepath) as svg:
+            for label, fragment in layers:
+                if not fragment.element_count:
+                    continue
+                dx = cursor - fragment.min[0]
+                dy = -fragment.min[1]
+                svg.write_fragment(fragment, label, dx, dy)
+                cursor += fragment.max[0] - fragment.min[0] + gap
+    finally:
+        for _, fragment in layers:
+            if os.path.exists(fragment.filepath):
+                os.remove(fragment.filepath)
+    return svg.element_count
@@ -0,0 +1,59 @@
+"""Kiểm tra cache diện tích khi kéo thanh trượt tạo viên nang.
+
+Cần chạy bằng Python của Blender, ví dụ:
+    blender -b --python-expr "import pytest, sys; sys.exit(pytest.main(['tests']))"
+Ngoài Blender (không có bpy) test được bỏ qua.
+"""
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+bpy = pytest.importorskip("bpy")
+
+ADDON_DIR = Path(__file__).resolve().parents[1]
+ADDON_NAME = "box_design_test"
+
+
+@pytest.fixture
+def addon():
+    bpy.ops.wm.read_homefile(use_empty=True)
+    spec = importlib.util.spec_from_file_location(
+        ADDON_NAME, ADDON_DIR / "__init__.py", submodule_search_locations=[str(ADDON_DIR)])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[ADDON_NAME] = module
+    spec.loader.exec_module(module)
+    module.register()
+    try:
+        yield module
+    finally:
+        module.unregister()
+        for name in [name for name in sys.modules if name == ADDON_NAME or name.startswith(ADDON_NAME + ".")]:
+            del sys.modules[name]
+
+
+def test_slider_updates_hit_source_area_cache(addon, monkeypatch):
+    area_utils = addon.area_utils
+    bpy.ops.mesh.primitive_plane_add(size=100)
+    source = bpy.context.active_object
+
+    calls = []
+    original = area_utils.mesh_surface_area
+
+    def counting_surface_area(mesh, matrix_world):
+        calls.append(mesh)
+        return original(mesh, matrix_world)
+
+    monkeypatch.setattr(area_utils, "mesh_surface_area", counting_surface_area)
+
+    settings = bpy.context.scene.shared_capsule_settings
+    for height in (10, 20, 30, 40, 50):
+        settings.height = height
+
+    # Sau lần đầu active object là viên nang, nhưng diện tích nguồn vẫn lấy từ cache
+    assert bpy.context.active_object is not source
+    assert bpy.context.active_object.name.startswith(f"Capsule2D_{source.name}")
+    assert len(calls) == 1
+    assert area_utils.calculate_area_of_selected_object(obj=source) == pytest.approx(100 * 100)
+    assert len(calls) == 1
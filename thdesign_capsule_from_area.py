@@ -1,7 +1,7 @@
 import bpy
 import math
 from .shared_props import SharedCapsuleSettings
-from .area_utils import calculate_area_of_selected_object
+from .area_utils import calculate_area_of_selected_object, invalidate_area_cache
 
 def update_capsule_from_area(self, context):
     try:
@@ -51,6 +51,7 @@ def create_capsule_polygon(radius, height, seg=32, horizontal=False):
     # Xóa capsule cũ nếu đang chọn cùng đối tượng
     for obj in list(bpy.data.objects):
         if obj.name == base_name or obj.name.startswith(base_name + "_"):
+            invalidate_area_cache(obj)
             bpy.data.objects.remove(obj, do_unlink=True)
 
     # Tìm tên chưa trùng
@@ -120,7 +121,8 @@ class OBJECT_OT_CreateCapsuleFromArea(bpy.types.Operator):
             self.report({'ERROR'}, "Chiều cao phải lớn hơn 0.")
             return {'CANCELLED'}
 
-        area = calculate_area_of_selected_object()
+        # Cache diện tích theo object nguồn, không theo active object (viên nang vừa tạo)
+        area = calculate_area_of_selected_object(obj=get_previous_selected_object())
         if area is None or area <= 0:
             self.report({'ERROR'}, "Vui lòng chọn một đối tượng Mesh hoặc Curve hợp lệ.")
             return {'CANCELLED'}
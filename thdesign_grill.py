@@ -0,0 +1,213 @@
+import bpy
+import numpy as np
+from bpy.props import FloatProperty, EnumProperty, IntProperty
+from mathutils import Matrix
+
+from . import selection_tracker
+from .area_utils import mesh_local_coords, mesh_triangle_indices
+from .loop_utils import triangle_islands, island_boundary_edges, chain_loops, nest_loops, signed_area
+from .grill_utils import grill_centers, hole_outline
+
+
+def panel_frame(coords):
+    # u theo trục X, v hướng lên để lưới lỗ thẳng hàng với cạnh hộp
+    origin = coords.mean(axis=0)
+    _, _, vt = np.linalg.svd(coords - origin, full_matrices=False)
+    normal = vt[2]
+    u = None
+    for axis in np.eye(3):
+        candidate = axis - normal * np.dot(axis, normal)
+        if np.linalg.norm(candidate) > 1e-3:
+            u = candidate / np.linalg.norm(candidate)
+            break
+    v = np.cross(normal, u)
+    up = np.array((0.0, 0.0, 1.0)) if abs(normal[2]) < 0.5 else np.array((0.0, 1.0, 0.0))
+    if np.dot(v, up) < 0:
+        normal, v = -normal, -v
+    return origin, u, v, normal
+
+
+def panel_outline(obj):
+    # None nếu mesh không có cạnh biên (ví dụ tấm đã có độ dày)
+    mesh = obj.data
+    tris = mesh_triangle_indices(mesh)
+    if not len(tris):
+        return None
+    coords = mesh_local_coords(mesh)
+    origin, u, v, normal = panel_frame(coords[np.unique(tris)])
+    flat = (coords - origin) @ np.column_stack((u, v))
+
+    loops = []
+    for edges in island_boundary_edges(tris, triangle_islands(tris)).values():
+        loops.extend(flat[loop] for loop in chain_loops(edges))
+    if not loops:
+        return None
+    groups = nest_loops(loops)
+    outer, holes = max(groups, key=lambda group: abs(signed_area(loops[group[0]])))
+
+    frame = np.eye(4)
+    frame[:3, 0] = u
+    frame[:3, 1] = v
+    frame[:3, 2] = normal
+    frame[:3, 3] = origin
+    return frame, loops[outer], [loops[hole] for hole in holes]
+
+
+def remove_grill(panel):
+    for obj in [obj for obj in bpy.data.objects if obj.get("grill_panel") == panel.name]:
+        meshes = [child.data for child in obj.children] + [obj.data]
+        for child in list(obj.children):
+            bpy.data.objects.remove(child, do_unlink=True)
+        bpy.data.objects.remove(obj, do_unlink=True)
+        for mesh in meshes:
+            if mesh.users == 0:
+                bpy.data.meshes.remove(mesh)
+
+
+def create_grill(panel, centers, outline, frame):
+    # Một object chỉ có đỉnh tại tâm lỗ (instance_type='VERTS') và một mesh lỗ làm con
+    points_mesh = bpy.data.meshes.new(f"{panel.name}_grill")
+    points_mesh.vertices.add(len(centers))
+    co = np.zeros((len(centers), 3), dtype=np.float32)
+    co[:, :2] = centers
+    points_mesh.vertices.foreach_set("co", co.ravel())
+    points_mesh.update()
+
+    hole_mesh = bpy.data.meshes.new(f"{panel.name}_grill_hole")
+    hole_mesh.from_pydata([(x, y, 0.0) for x, y in outline], [], [list(range(len(outline)))])
+    hole_mesh.update()
+
+    grill = bpy.data.objects.new(f"{panel.name}_grill", points_mesh)
+    grill.matrix_world = panel.matrix_world @ Matrix(frame.tolist())
+    grill.instance_type = 'VERTS'
+    grill["grill_panel"] = panel.name
+    grill["grill_hole_count"] = len(centers)
+
+    hole = bpy.data.objects.new(f"{panel.name}_grill_hole", hole_mesh)
+    hole.parent = grill
+    hole["grill_hole"] = True
+
+    for collection in panel.users_collection:
+        collection.objects.link(grill)
+        collection.objects.link(hole)
+    return grill
+
+
+class GrillProperties(bpy.types.PropertyGroup):
+    pattern: EnumProperty(
+        name="Kiểu lưới",
+        items=[
+            ('HEX', "Lục giác", "Hàng lệch nửa bước, các lỗ cách đều nhau"),
+            ('SQUARE', "Vuông", "Lỗ thẳng hàng theo hai trục"),
+        ],
+        default='HEX',
+    )
+    hole_shape: EnumProperty(
+        name="Hình lỗ",
+        items=[
+            ('ROUND', "Tròn", ""),
+            ('SQUARE', "Vuông", ""),
+            ('HEX', "Lục giác", ""),
+        ],
+        default='ROUND',
+    )
+    hole_size: FloatProperty(
+        name="Cỡ lỗ",
+        description="Đường kính (lỗ tròn) hoặc khoảng cách hai cạnh đối (mm)",
+        default=4.0,
+        min=0.01,
+    )
+    pitch: FloatProperty(
+        name="Bước",
+        description="Khoảng cách tâm hai lỗ liền kề (mm)",
+        default=6.0,
+        min=0.01,
+    )
+    margin: FloatProperty(
+        name="Lề",
+        description="Khoảng cách tối thiểu từ mép lỗ tới mép tấm (mm)",
+        default=5.0,
+        min=0.0,
+    )
+    segments: IntProperty(
+        name="Số cạnh lỗ tròn",
+        default=32,
+        min=3,
+        max=256,
+    )
+
+
+class OBJECT_OT_CreateGrill(bpy.types.Operator):
+    bl_idname = "object.create_grill"
+    bl_label = "Tạo lưới lỗ"
+    bl_description = "Bố trí lỗ loa/tản nhiệt trong đường bao tấm đang chọn (lỗ dạng instance)"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        panel = context.active_object
+        if not panel or panel.type != 'MESH' or "grill_panel" in panel:
+            self.report({'ERROR'}, "Hãy chọn một tấm (mesh phẳng)")
+            return {'CANCELLED'}
+        if panel.mode == 'EDIT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        result = panel_outline(panel)
+        if result is None:
+            self.report({'ERROR'}, "Tấm không có đường bao (cần mesh phẳng, chưa có độ dày)")
+            return {'CANCELLED'}
+        frame, outer, holes = result
+
+        props = context.scene.grill_props
+        outline = hole_outline(props.hole_shape, props.hole_size, props.segments)
+        # Bán kính bao của lỗ: lỗ vuông/lục giác không chạm mép ở bất kỳ góc nào
+        radius = float(np.linalg.norm(outline, axis=1).max())
+        centers = grill_centers(outer, holes, props.pitch, radius, props.margin, props.pattern)
+
+        if not len(centers):
+            # Huỷ mà không đụng tới lưới cũ: operator bị huỷ không tạo bước undo
+            self.report({'WARNING'}, "Không đặt được lỗ nào, hãy giảm lề hoặc cỡ lỗ")
+            return {'CANCELLED'}
+        remove_grill(panel)
+        create_grill(panel, centers, outline, frame)
+        selection_tracker.mark_selection_dirty()
+        self.report({'INFO'}, f"Đã tạo {len(centers)} lỗ")
+        return {'FINISHED'}
+
+
+class VIEW3D_PT_GrillPanel(bpy.types.Panel):
+    bl_label = "Lưới lỗ loa"
+    bl_idname = "VIEW3D_PT_grill"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = 'Box Design'
+    bl_parent_id = "PT_THToolsPanel"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.grill_props
+        layout.prop(props, "pattern")
+        layout.prop(props, "hole_shape")
+        layout.prop(props, "hole_size")
+        if props.hole_shape == 'ROUND':
+            layout.prop(props, "segments")
+        layout.prop(props, "pitch")
+        layout.prop(props, "margin")
+        layout.operator("object.create_grill")
+
+
+classes = (
+    GrillProperties,
+    OBJECT_OT_CreateGrill,
+    VIEW3D_PT_GrillPanel,
+)
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+    bpy.types.Scene.grill_props = bpy.props.PointerProperty(type=GrillProperties)
+
+def unregister():
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
+    del bpy.types.Scene.grill_props
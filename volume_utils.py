@@ -0,0 +1,130 @@
+import bpy
+import numpy as np
+from collections import namedtuple
+from mathutils import Matrix
+from bpy.app.handlers import persistent
+
+from . import depsgraph_dispatcher
+from .area_utils import mesh_world_coords, mesh_triangle_indices
+
+# Cache kết quả kiểm tra kín: con trỏ mesh -> ((số đỉnh, cạnh, loop), WatertightReport)
+_watertight_cache = {}
+
+
+def signed_volume(coords, tris):
+    if not len(tris):
+        return 0.0
+    # Dời gốc về trọng tâm để giảm sai số làm tròn trên mesh lớn
+    coords = coords - coords.mean(axis=0)
+    a = coords[tris[:, 0]]
+    b = coords[tris[:, 1]]
+    c = coords[tris[:, 2]]
+    return float(np.einsum('ij,ij->i', a, np.cross(b, c)).sum() / 6.0)
+
+
+def mesh_volume(mesh, matrix_world=None):
+    # matrix_world=None nghĩa là local space
+    tris = mesh_triangle_indices(mesh)
+    if not len(tris):
+        return 0.0
+    coords = mesh_world_coords(mesh, matrix_world if matrix_world is not None else Matrix.Identity(4))
+    return abs(signed_volume(coords, tris))
+
+
+class WatertightReport(namedtuple("WatertightReport", "boundary_edges non_manifold_edges wire_edges")):
+    # Số cạnh thuộc 1 mặt (biên), >2 mặt (non-manifold) và 0 mặt (cạnh rời)
+    __slots__ = ()
+
+    @property
+    def is_watertight(self):
+        return self.boundary_edges == 0
+
+    @property
+    def is_manifold(self):
+        return self.boundary_edges == 0 and self.non_manifold_edges == 0
+
+
+def analyse_watertight(mesh):
+    key = mesh.as_pointer()
+    fingerprint = (len(mesh.vertices), len(mesh.edges), len(mesh.loops))
+    cached = _watertight_cache.get(key)
+    if cached and cached[0] == fingerprint:
+        return cached[1]
+
+    edge_index = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("edge_index", edge_index)
+    face_count = np.bincount(edge_index, minlength=len(mesh.edges))
+    report = WatertightReport(
+        boundary_edges=int(np.count_nonzero(face_count == 1)),
+        non_manifold_edges=int(np.count_nonzero(face_count > 2)),
+        wire_edges=int(np.count_nonzero(face_count == 0)),
+    )
+    if not len(mesh.loops):
+        # Không có mặt nào thì không thể là khối kín
+        report = report._replace(boundary_edges=max(report.boundary_edges, 1))
+    _watertight_cache[key] = (fingerprint, report)
+    return report
+
+
+def invalidate_watertight_cache(mesh=None):
+    if mesh is None:
+        _watertight_cache.clear()
+    else:
+        _watertight_cache.pop(mesh.as_pointer(), None)
+
+
+def draw_watertight_report(layout, report):
+    if report.is_manifold:
+        layout.label(text="Mesh kín", icon='CHECKMARK')
+        return
+    if report.boundary_edges:
+        layout.label(text=f"Hở: {report.boundary_edges} cạnh biên", icon='ERROR')
+    if report.non_manifold_edges:
+        layout.label(text=f"{report.non_manifold_edges} cạnh non-manifold", icon='ERROR')
+
+
+def invalidate_watertight_cache_from_events(scene, events):
+    if not _watertight_cache:
+        return
+    for id_data in events.geometry_ids:
+        if isinstance(id_data, bpy.types.Object):
+            id_data = id_data.data
+        if isinstance(id_data, bpy.types.Mesh):
+            invalidate_watertight_cache(id_data)
+
+
+@persistent
+def watertight_cache_load_handler(*args):
+    invalidate_watertight_cache()
+
+
+def evaluated_volume(obj, depsgraph):
+    if obj.type != 'MESH':
+        return 0.0
+    eval_obj = obj.evaluated_get(depsgraph)
+    mesh = eval_obj.to_mesh()
+    if not mesh:
+        return 0.0
+    try:
+        return mesh_volume(mesh, obj.matrix_world)
+    finally:
+        eval_obj.to_mesh_clear()
+
+
+def data_volume(obj, matrix_world=None):
+    if obj.type != 'MESH':
+        return 0.0
+    return mesh_volume(obj.data, matrix_world)
+
+
+def register():
+    depsgraph_dispatcher.subscribe("watertight_cache", invalidate_watertight_cache_from_events, {'GEOMETRY'}, priority=-10)
+    if watertight_cache_load_handler not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(watertight_cache_load_handler)
+
+
+def unregister():
+    depsgraph_dispatcher.unsubscribe("watertight_cache")
+    if watertight_cache_load_handler in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(watertight_cache_load_handler)
+    invalidate_watertight_cache()